@@ -1,77 +1,49 @@
-import os
 import json
-from openai import OpenAI
-from dotenv import load_dotenv
-from trend_genration import generate_trends, generate_habits
-# --- CONFIGURATION ---
-load_dotenv()
-key=os.getenv("KEY")
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=key
-)
+import llm_client
+from habit_features import TOKEN_BUDGETS, extract_features, fit_prompt
+from prompt_registry import registry
+from trend_genration import generate_trends, generate_habits, record_transactions
 
 class SmartSpendAI:
-    def __init__(self):
-        self.planner_file = "prompts/planner_prompt.json"
-        self.recalc_file = "prompts/recalibrator_prompt.json"
-
-    def _load_json_file(self, path):
-        with open(path, "r") as f:
-            return json.load(f)
+    # Prompts come preloaded and validated from prompt_registry
+    planner_prompt = "planner"
+    recalc_prompt = "recalibrator"
 
     def generate_plan(self, user_profile, past_trends):
         """Phase 1: Initial Trend-Aware Planning"""
-        config = self._load_json_file(self.planner_file)
+        prompt = registry.get(self.planner_prompt)
         
-        # Prepare Data
-        user_data = {
+        # Prepare Data (trends are trimmed to the planner's token budget)
+        user_data = fit_prompt(prompt, TOKEN_BUDGETS["planner"], fixed={
             "income": user_profile['income'],
             "rent": user_profile['rent'],
             "essentials": user_profile['essentials'],
             "goals_json": json.dumps(user_profile['goals']),
-            "trends_json": json.dumps(past_trends)
-        }
+        }, compressible={"trends_json": past_trends})
 
-        response = client.chat.completions.create(
-            model="openrouter/free", # High-reliability auto-routing
-            messages=[
-                {"role": "system", "content": config["system_prompt"]},
-                {"role": "user", "content": config["user_template"].format(**user_data)}
-            ],
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+        return llm_client.complete_json(prompt.messages(**user_data))
     def recalibrate(self, status, past_week_tx, habits):
         """
         Updated Phase 2: Analyzes week trends and habits 
         to determine the severity of the recalibration.
         """
-        config = self._load_json_file(self.recalc_file)
+        prompt = registry.get(self.recalc_prompt)
         
-        # 1. Self-generate habit insights from the past week
-        habits = habits
+        # 1. Self-generate habit insights from the past week: a raw
+        #    transaction list is replaced by its features
+        if isinstance(past_week_tx, list) and all(isinstance(t, dict) and "amount" in t for t in past_week_tx):
+            past_week_tx = extract_features(past_week_tx)
         
-        # 2. Prepare the payload
-        recalc_payload = {
+        # 2. Prepare the payload within the recalibrator's token budget
+        recalc_payload = fit_prompt(prompt, TOKEN_BUDGETS["recalibrator"], fixed={
             "overage_amount": status['overage'],
             "days_left": status['days_left'],
             "budget_left": status['budget_left'],
             "cheat_count": status['cheat_count'],
             "goal_name": status['goal_name'],
-            "past_week_json": json.dumps(past_week_tx),
-            "habits_json": json.dumps(habits)
-        }
+        }, compressible={"past_week_json": past_week_tx, "habits_json": habits})
         
-        response = client.chat.completions.create(
-            model="openrouter/free",
-            messages=[
-                {"role": "system", "content": config["system_prompt"]},
-                {"role": "user", "content": config["user_template"].format(**recalc_payload)}
-            ],
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+        return llm_client.complete_json(prompt.messages(**recalc_payload))
 # --- EXECUTION / TESTING ---
 if __name__ == "__main__":
     ai = SmartSpendAI()
@@ -189,7 +161,8 @@ if __name__ == "__main__":
     ]
 
     past_trends = generate_habits(transactions_month) # Simulate past spending trends for January
-    weekly_trends = generate_trends(transactions_month[-7:]) # Last 7 transactions as weekly trend
+    record_transactions("demo_user", transactions_month) # Ingest January as it would arrive
+    weekly_trends = generate_trends("demo_user") # Last 7 days, read from the rolling windows
     # 2. RUN PLANNER
     print("\n[STEP 1] Generating Trend-Aware Plan...")
     try:
@@ -0,0 +1,174 @@
+import json
+import math
+import os
+from datetime import date
+from trend_engine import IMPULSE_CATEGORIES, day_number
+
+# --- CONFIGURATION ---
+# Rough tokens-per-character for English/JSON prompts (no tokenizer dependency)
+CHARS_PER_TOKEN = float(os.getenv("PROMPT_CHARS_PER_TOKEN", "4"))
+TOP_N = int(os.getenv("HABIT_TOP_N", "5"))
+# Token budget of each prompt's user message, data fields included
+TOKEN_BUDGETS = {
+    "habits": int(os.getenv("HABITS_TOKEN_BUDGET", "250")),
+    "planner": int(os.getenv("PLANNER_TOKEN_BUDGET", "600")),
+    "recalibrator": int(os.getenv("RECALIBRATOR_TOKEN_BUDGET", "500")),
+    "warning": int(os.getenv("WARNING_TOKEN_BUDGET", "400")),
+}
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _money(value):
+    value = round(value, 2)
+    return int(value) if value == int(value) else value
+
+
+def _pct(part, whole):
+    return round(100 * part / whole, 1) if whole else 0.0
+
+
+# --- FEATURE EXTRACTION ---
+def extract_features(transactions, top_n=TOP_N):
+    """
+    Deterministic habit features from raw transactions: frequency,
+    per-category share, top merchants and weekday pattern. Lists are
+    ordered most significant first, so trimming from the end loses the least.
+    """
+    transactions = list(transactions)
+    if not transactions:
+        return {"count": 0, "total": 0}
+
+    total = sum(t["amount"] for t in transactions)
+    days = [day_number(t["date"]) for t in transactions]
+    span = max(days) - min(days) + 1
+
+    categories, merchants = {}, {}
+    weekday_spend = [0] * 7
+    impulse = 0
+    for t, day in zip(transactions, days):
+        category = str(t.get("category", "other")).lower()
+        spend, count = categories.get(category, (0, 0))
+        categories[category] = (spend + t["amount"], count + 1)
+        if category in IMPULSE_CATEGORIES:
+            impulse += t["amount"]
+
+        # Merchant = the description, compared case-insensitively
+        name = " ".join(str(t.get("description", "")).split())
+        if name:
+            key = name.lower()
+            first_name, spend, count = merchants.get(key, (name, 0, 0))
+            merchants[key] = (first_name, spend + t["amount"], count + 1)
+
+        weekday_spend[date.fromordinal(day).weekday()] += t["amount"]
+
+    by_spend = sorted(categories.items(), key=lambda kv: (-kv[1][0], kv[0]))
+    by_visits = sorted(merchants.values(), key=lambda m: (-m[2], -m[1], m[0]))
+    peak = max(range(7), key=lambda d: weekday_spend[d])
+
+    return {
+        "count": len(transactions),
+        "total": _money(total),
+        "frequency": {
+            "days": span,
+            "active_days": len(set(days)),
+            "per_day": round(len(transactions) / span, 2),
+            "avg_ticket": _money(total / len(transactions)),
+        },
+        "impulse_share": _pct(impulse, total),
+        "categories": [
+            {"category": c, "share": _pct(spend, total), "spend": _money(spend), "count": count}
+            for c, (spend, count) in by_spend
+        ],
+        "top_merchants": [
+            {"merchant": name, "count": count, "spend": _money(spend)}
+            for name, spend, count in by_visits[:top_n]
+        ],
+        "weekdays": {
+            "peak_day": WEEKDAYS[peak],
+            "weekend_share": _pct(weekday_spend[5] + weekday_spend[6], total),
+            "spend": {WEEKDAYS[d]: _money(weekday_spend[d]) for d in range(7)},
+        },
+    }
+
+
+def describe_habits(features):
+    """A short plain-text summary of extract_features output, no model call."""
+    if not features.get("count"):
+        return "No spending recorded yet."
+    freq = features["frequency"]
+    cats = ", ".join(f"{c['category']} {c['share']:g}%" for c in features["categories"][:3])
+    parts = [
+        f"{features['count']} transactions over {freq['days']} days "
+        f"({freq['per_day']:g}/day, avg ₹{freq['avg_ticket']}).",
+        f"Top categories: {cats}.",
+        f"Impulse spend {features['impulse_share']:g}%.",
+    ]
+    if features["top_merchants"]:
+        top = features["top_merchants"][0]
+        parts.append(f"Most frequent: {top['merchant']} ({top['count']}x).")
+    weekdays = features["weekdays"]
+    parts.append(f"Peak day {weekdays['peak_day']}; weekends {weekdays['weekend_share']:g}% of spend.")
+    return " ".join(parts)
+
+
+# --- PROMPT BUDGET ---
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _encode(value):
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _shrink(value):
+    """`value` one step smaller, or None when there is nothing left to trim."""
+    if isinstance(value, list):
+        if len(value) > 1:
+            return value[: len(value) // 2]
+        smaller = _shrink(value[0]) if value else None
+        return None if smaller is None else [smaller]
+    if isinstance(value, dict):
+        # Trim the biggest entry; drop it once it cannot get smaller
+        for key in sorted(value, key=lambda k: -len(_encode(value[k]))):
+            smaller = _shrink(value[key])
+            if smaller is not None:
+                return {**value, key: smaller}
+        if len(value) > 1:
+            biggest = max(value, key=lambda k: len(_encode(value[k])))
+            return {k: v for k, v in value.items() if k != biggest}
+        return None
+    if isinstance(value, str) and len(value) > 24:
+        return value[: len(value) // 2].rstrip() + "…"
+    return None
+
+
+def compact(values, budget):
+    """
+    JSON-encodes each value (strings pass through) and trims the largest,
+    a step at a time, until together they fit in `budget` tokens or nothing
+    is left to trim.
+    """
+    values = dict(values)
+    while True:
+        encoded = {name: _encode(v) for name, v in values.items()}
+        if sum(estimate_tokens(text) for text in encoded.values()) <= budget:
+            return encoded
+        for name in sorted(encoded, key=lambda n: -len(encoded[n])):
+            smaller = _shrink(values[name])
+            if smaller is not None:
+                values[name] = smaller
+                break
+        else:
+            return encoded
+
+
+def fit_prompt(prompt, budget, fixed=None, compressible=None):
+    """
+    Values for `prompt.messages()`: `fixed` ones go in as given, while the
+    `compressible` ones are compacted into whatever of `budget` the template
+    text and fixed values leave over.
+    """
+    fixed = fixed or {}
+    reserved = estimate_tokens(prompt.literal_text) + sum(estimate_tokens(str(v)) for v in fixed.values())
+    return {**fixed, **compact(compressible or {}, max(budget - reserved, 0))}
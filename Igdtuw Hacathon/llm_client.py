@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from dotenv import load_dotenv
+
+# --- CONFIGURATION ---
+# One client per process, shared by goals.py, trend_genration.py and warning.py.
+# Point LLM_BASE_URL at llm_stub_server.py to replay recorded responses offline.
+load_dotenv()
+KEY = os.getenv("KEY")
+BASE_URL = os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1")
+MODEL = os.getenv("LLM_MODEL", "openrouter/free")  # High-reliability auto-routing
+TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+CACHE_ENABLED = os.getenv("LLM_CACHE", "on").lower() != "off"
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache"))
+
+_client = None
+# The async client's connection pool and the concurrency semaphore belong to
+# the event loop that created them, so each running loop gets its own pair
+_async_state = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _limits():
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+
+
+def get_client():
+    """Pooled, keep-alive sync client (created on first use, not at import)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenAI(
+                    base_url=BASE_URL,
+                    api_key=KEY or "missing-key",
+                    timeout=TIMEOUT_SECONDS,
+                    http_client=httpx.Client(limits=_limits(), timeout=TIMEOUT_SECONDS),
+                )
+    return _client
+
+
+def _loop_state():
+    """(AsyncOpenAI client, semaphore) for the running event loop."""
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        with _lock:
+            state = _async_state.get(loop)
+            if state is None:
+                client = AsyncOpenAI(
+                    base_url=BASE_URL,
+                    api_key=KEY or "missing-key",
+                    timeout=TIMEOUT_SECONDS,
+                    http_client=httpx.AsyncClient(limits=_limits(), timeout=TIMEOUT_SECONDS),
+                )
+                state = _async_state[loop] = (client, asyncio.Semaphore(MAX_CONCURRENCY))
+    return state
+
+
+def get_async_client():
+    """Pooled async client for the running event loop (one per loop)."""
+    return _loop_state()[0]
+
+
+# --- DISK CACHE ---
+def cache_key(model, messages, json_mode=False):
+    """sha256 of the exact request: same model + same prompt = same answer."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "json": bool(json_mode)},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def cache_get(key):
+    try:
+        with open(_cache_path(key), "r", encoding="utf-8") as f:
+            return json.load(f)["content"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def cache_put(key, model, content):
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write-then-rename so a concurrent reader never sees a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"model": model, "content": content}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _request(model, messages, json_mode):
+    kwargs = {"model": model, "messages": messages}
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+# --- PUBLIC API ---
+def complete(messages, model=None, json_mode=False, use_cache=True):
+    """Chat completion text, served from the disk cache when the prompt was seen before."""
+    model = model or MODEL
+    key = cache_key(model, messages, json_mode)
+    if CACHE_ENABLED and use_cache:
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+
+    response = get_client().chat.completions.create(**_request(model, messages, json_mode))
+    content = response.choices[0].message.content
+    if CACHE_ENABLED and use_cache and content is not None:
+        cache_put(key, model, content)
+    return content
+
+
+def complete_json(messages, model=None, use_cache=True):
+    return json.loads(complete(messages, model, json_mode=True, use_cache=use_cache))
+
+
+async def complete_async(messages, model=None, json_mode=False, use_cache=True):
+    """Async variant; at most LLM_MAX_CONCURRENCY requests per event loop are in flight at once."""
+    model = model or MODEL
+    key = cache_key(model, messages, json_mode)
+    if CACHE_ENABLED and use_cache:
+        cached = await asyncio.to_thread(cache_get, key)
+        if cached is not None:
+            return cached
+
+    client, semaphore = _loop_state()
+    async with semaphore:
+        response = await client.chat.completions.create(**_request(model, messages, json_mode))
+    content = response.choices[0].message.content
+    if CACHE_ENABLED and use_cache and content is not None:
+        await asyncio.to_thread(cache_put, key, model, content)
+    return content
+
+
+async def complete_json_async(messages, model=None, use_cache=True):
+    return json.loads(await complete_async(messages, model, json_mode=True, use_cache=use_cache))
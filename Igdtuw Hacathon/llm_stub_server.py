@@ -0,0 +1,84 @@
+"""
+Local stand-in for the OpenRouter chat completions API.
+
+Replays responses recorded in the llm_client disk cache (every real call
+made with the cache on records one), so the AI modules can be exercised
+offline and deterministically:
+
+    python llm_stub_server.py --port 8765 --cache-dir .llm_cache
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 LLM_CACHE=off python goals.py
+
+Prompts with no recording get a 404, or --default's content if given.
+"""
+import argparse
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import llm_client
+
+
+def _completion(model, content):
+    # Minimal OpenAI-compatible chat.completion body
+    return {
+        "id": f"stub-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def make_handler(default_content=None):
+    class StubHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            model = request.get("model", llm_client.MODEL)
+            json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+            key = llm_client.cache_key(model, request.get("messages", []), json_mode)
+
+            content = llm_client.cache_get(key)
+            if content is None:
+                content = default_content
+            if content is None:
+                return self._send(404, {"error": {"message": f"No recorded response for prompt {key}"}})
+            self._send(200, _completion(model, content))
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return StubHandler
+
+
+def serve(host="127.0.0.1", port=8765, default_content=None):
+    server = ThreadingHTTPServer((host, port), make_handler(default_content))
+    print(f"LLM stub replaying {llm_client.CACHE_DIR} on http://{host}:{server.server_port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded LLM responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-dir", help="Recordings directory (defaults to LLM_CACHE_DIR)")
+    parser.add_argument("--default", help="Content returned for prompts with no recording")
+    args = parser.parse_args()
+    if args.cache_dir:
+        llm_client.CACHE_DIR = os.path.abspath(args.cache_dir)
+    serve(args.host, args.port, args.default)
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import string
+import threading
+import time
+
+# --- CONFIGURATION ---
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+# How often (seconds) a prompt file's mtime is re-checked for hot reload
+RELOAD_CHECK_SECONDS = float(os.getenv("PROMPT_RELOAD_CHECK_SECONDS", "1.0"))
+
+logger = logging.getLogger("prompt_registry")
+
+# Prompt name -> (file in prompts/, placeholders its user_template must use)
+PROMPT_SPECS = {
+    "planner": ("planner_prompt.json", {"income", "rent", "essentials", "goals_json", "trends_json"}),
+    "recalibrator": ("recalibrator_prompt.json", {
+        "overage_amount", "days_left", "budget_left", "cheat_count",
+        "goal_name", "past_week_json", "habits_json",
+    }),
+    "warning": ("prompt_warn.json", {
+        "previous_spending_habits", "latest_transaction_trend", "current_bank_balance",
+    }),
+}
+
+
+class PromptError(ValueError):
+    pass
+
+
+class Prompt:
+    """A validated prompt file with its user_template parsed once."""
+
+    def __init__(self, name, path, expected_fields):
+        self.name = name
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        for field in ("system_prompt", "user_template"):
+            if not isinstance(config.get(field), str):
+                raise PromptError(f"{path}: '{field}' must be a string")
+        self.system_prompt = config["system_prompt"]
+        self.model_parameters = config.get("model_parameters", {})
+
+        # Compile: (literal text, placeholder) pieces, rendered by joining
+        self._pieces = []
+        try:
+            parsed = list(string.Formatter().parse(config["user_template"]))
+        except ValueError as e:
+            raise PromptError(f"{path}: malformed user_template ({e})") from None
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise PromptError(f"{path}: placeholder '{{{field}}}' must be a plain name")
+            self._pieces.append((literal, field))
+        self.fields = {field for _, field in self._pieces if field is not None}
+        # Template text without its values, for prompt token budgeting
+        self.literal_text = "".join(literal for literal, _ in self._pieces)
+
+        if self.fields != set(expected_fields):
+            missing = sorted(set(expected_fields) - self.fields)
+            unknown = sorted(self.fields - set(expected_fields))
+            raise PromptError(
+                f"{path}: user_template placeholders do not match the inputs of '{name}'"
+                f" (missing: {missing or 'none'}, unexpected: {unknown or 'none'})"
+            )
+
+    def render(self, **values):
+        """The user message for `values`, which must cover every placeholder."""
+        missing = self.fields - values.keys()
+        if missing:
+            raise PromptError(f"Prompt '{self.name}' is missing inputs: {sorted(missing)}")
+        return "".join(
+            literal + ("" if field is None else str(values[field]))
+            for literal, field in self._pieces
+        )
+
+    def messages(self, **values):
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.render(**values)},
+        ]
+
+
+class PromptRegistry:
+    """
+    Loads and validates every prompt once (a bad file fails at import, not
+    mid-request) and reloads a prompt only after its file's mtime changes.
+    """
+
+    def __init__(self, specs=PROMPT_SPECS, directory=PROMPTS_DIR):
+        self.specs = specs
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._prompts = {name: self._load(name) for name in specs}
+        self._checked_at = {name: time.monotonic() for name in specs}
+        self._failed_mtime = {}
+
+    def _load(self, name):
+        filename, expected_fields = self.specs[name]
+        return Prompt(name, os.path.join(self.directory, filename), expected_fields)
+
+    def get(self, name):
+        if name not in self._prompts:
+            raise PromptError(f"Unknown prompt '{name}'")
+        now = time.monotonic()
+        if now - self._checked_at[name] >= RELOAD_CHECK_SECONDS:
+            self._maybe_reload(name, now)
+        return self._prompts[name]
+
+    def _maybe_reload(self, name, now):
+        with self._lock:
+            self._checked_at[name] = now
+            current = self._prompts[name]
+            try:
+                mtime = os.stat(current.path).st_mtime
+            except OSError as e:
+                logger.warning("Prompt file unavailable, keeping previous '%s': %s", name, e)
+                return
+            if mtime in (current.mtime, self._failed_mtime.get(name)):
+                return
+            try:
+                self._prompts[name] = self._load(name)
+            except (OSError, ValueError) as e:
+                # A broken edit keeps the last good version serving
+                self._failed_mtime[name] = mtime
+                logger.warning("Prompt reload failed, keeping previous '%s': %s", name, e)
+
+
+registry = PromptRegistry()
@@ -0,0 +1,160 @@
+import os
+import threading
+from datetime import date
+from functools import lru_cache
+
+# --- CONFIGURATION ---
+# Rolling windows (days, ending on the queried date inclusive) reported per query
+WINDOWS = tuple(int(d) for d in os.getenv("TREND_WINDOWS", "7,30,90").split(","))
+IMPULSE_CATEGORIES = frozenset(
+    c.strip().lower() for c in os.getenv("IMPULSE_CATEGORIES", "food,entertainment,shopping").split(",")
+)
+
+
+@lru_cache(maxsize=4096)
+def day_number(value):
+    """'YYYY-MM-DD' (or a date) -> proleptic ordinal. Dates repeat a lot, so parses are cached."""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(value[:10]).toordinal()
+
+
+class SpendingSeries:
+    """
+    One user's spending as dense daily buckets plus running prefix sums, so
+    the total over any [end - days + 1, end] window is two lookups.
+
+    In-order transactions (the usual case) extend the prefix sums in place.
+    A back-dated one only marks the sums stale from its day; they are
+    rebuilt from there on the next query.
+    """
+
+    # Parallel series kept per day
+    FIELDS = ("total", "impulse", "count")
+
+    def __init__(self, transactions=()):
+        self._first = None                  # ordinal of bucket 0
+        self._daily = {f: [] for f in self.FIELDS}
+        self._prefix = {f: [] for f in self.FIELDS}  # prefix[i] = sum of buckets 0..i
+        self._stale_from = None             # first index whose prefix is out of date
+        self._lock = threading.Lock()
+        self.add_many(transactions)
+
+    # --- updates ---
+    def add(self, transaction):
+        self.add_many([transaction])
+
+    def add_many(self, transactions):
+        with self._lock:
+            for t in transactions:
+                impulse = t["amount"] if str(t.get("category", "")).lower() in IMPULSE_CATEGORIES else 0
+                self._add(day_number(t["date"]), {"total": t["amount"], "impulse": impulse, "count": 1})
+
+    def _add(self, day, values):
+        if self._first is None:
+            self._first = day
+        if day < self._first:
+            # Grow to the left: shift every bucket and rebuild all sums
+            pad = self._first - day
+            for f in self.FIELDS:
+                self._daily[f][:0] = [0] * pad
+            self._first = day
+            self._stale_from = 0
+
+        index = day - self._first
+        size = len(self._daily["total"])
+        for f in self.FIELDS:
+            if index >= size:
+                self._daily[f].extend([0] * (index + 1 - size))
+            self._daily[f][index] += values[f]
+
+        if self._stale_from is None and index >= size - 1:
+            # At or past the last day: extend the running sums in place
+            for f in self.FIELDS:
+                prefix = self._prefix[f]
+                if index == size - 1:
+                    prefix[-1] += values[f]
+                else:
+                    carry = prefix[-1] if prefix else 0
+                    prefix.extend([carry] * (index - size))
+                    prefix.append(carry + values[f])
+        else:
+            self._stale_from = index if self._stale_from is None else min(self._stale_from, index)
+
+    def _refresh(self):
+        start = self._stale_from
+        if start is None:
+            return
+        for f in self.FIELDS:
+            daily, prefix = self._daily[f], self._prefix[f]
+            del prefix[start:]
+            running = prefix[-1] if prefix else 0
+            for value in daily[start:]:
+                running += value
+                prefix.append(running)
+        self._stale_from = None
+
+    # --- queries ---
+    @property
+    def last_day(self):
+        """Date of the latest bucket, or None when nothing was recorded."""
+        if self._first is None:
+            return None
+        return date.fromordinal(self._first + len(self._daily["total"]) - 1)
+
+    def _sum_to(self, field, index):
+        # Prefix sum through bucket `index`, clamped to the recorded range
+        if index < 0:
+            return 0
+        prefix = self._prefix[field]
+        return prefix[min(index, len(prefix) - 1)]
+
+    def window(self, days, end=None):
+        """Totals for the `days` days ending on `end` (default: the latest day), inclusive."""
+        if days < 1:
+            raise ValueError("Window must be at least 1 day")
+        with self._lock:
+            self._refresh()
+            if self._first is None:
+                return {"days": days, "total": 0, "impulse": 0, "count": 0}
+            end_index = (day_number(end) if end is not None else self._first + len(self._daily["total"]) - 1) - self._first
+            result = {"days": days}
+            for f in self.FIELDS:
+                result[f] = self._sum_to(f, end_index) - self._sum_to(f, end_index - days)
+            return result
+
+    def velocity(self, end=None, windows=WINDOWS):
+        """Every configured window ending on `end`, with the average daily spend of each."""
+        end = date.fromordinal(day_number(end)) if end is not None else self.last_day
+        report = {"as_of": end.isoformat() if end is not None else None, "windows": {}}
+        for days in windows:
+            w = self.window(days, end)
+            w["daily_average"] = round(w["total"] / days, 2)
+            report["windows"][f"{days}d"] = w
+        return report
+
+
+class TrendEngine:
+    """Per-user SpendingSeries, fed as transactions arrive."""
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def series(self, user_id):
+        with self._lock:
+            if user_id not in self._series:
+                self._series[user_id] = SpendingSeries()
+            return self._series[user_id]
+
+    def record(self, user_id, transaction):
+        self.series(user_id).add(transaction)
+
+    def record_many(self, user_id, transactions):
+        self.series(user_id).add_many(transactions)
+
+    def velocity(self, user_id, end=None):
+        return self.series(user_id).velocity(end)
+
+
+engine = TrendEngine()
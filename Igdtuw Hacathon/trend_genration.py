@@ -1,65 +1,63 @@
-import json
-from openai import OpenAI
-from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
-load_dotenv()
-key=os.getenv("KEY")
-client = OpenAI(
-  base_url="https://openrouter.ai/api/v1",
-  api_key=key,
-)
+import llm_client
+from habit_features import TOKEN_BUDGETS, compact, describe_habits, estimate_tokens, extract_features
+from trend_engine import IMPULSE_CATEGORIES, engine
 
-def generate_habits(transactions):
+def generate_habits(transactions, narrate=True):
+    """
+    Habit description for the planner. With narrate=False the summary is
+    built locally from the extracted features, with no model call.
+    """
     # --- Local Pre-processing ---
-    total_spent = sum(t['amount'] for t in transactions)
-    categories = {}
-    for t in transactions:
-        categories[t['category']] = categories.get(t['category'], 0) + t['amount']
-    
-    # Sort categories by highest spend
-    sorted_cats = sorted(categories.items(), key=lambda x: x[1], reverse=True)
+    features = extract_features(transactions)
+    if not narrate:
+        return describe_habits(features)
     
     # --- AI Narrative ---
-    # We ask the AI to turn this data into a 'habit description' for our main predictor
-    trend_prompt = f"""
+    # We ask the AI to turn the features (not the raw list) into a 'habit description'
+    instructions = """
     Summarize these Indian student spending habits for an AI budgeter. 
-    Total spent: ₹{total_spent}. 
-    Category breakdown: {sorted_cats}.
-    Top expenses: {[t['description'] for t in transactions[:5]]}.
     Keep it under 50 words. Focus on frequency and lifestyle.
-    """
+    Habit features (amounts in ₹, shares in %): """
+    budget = TOKEN_BUDGETS["habits"] - estimate_tokens(instructions)
+    trend_prompt = instructions + compact({"features": features}, budget)["features"]
     
-    response = client.chat.completions.create(
-        model="openrouter/free", 
-        messages=[{"role": "user", "content": trend_prompt}]
+    return llm_client.complete([{"role": "user", "content": trend_prompt}])
+
+def record_transactions(user_id, transactions):
+    """
+    Ingest path: call whenever transactions are written, so the user's
+    daily buckets in trend_engine.engine stay current.
+    """
+    engine.record_many(user_id, transactions)
+
+def generate_trends(user_id, as_of=None):
+    """
+    Weekly velocity narrative from the windows trend_engine.engine keeps
+    for `user_id` (fed by record_transactions); nothing is rescanned.
+    `as_of` defaults to the user's latest transaction date.
+    """
+    # --- Local Pre-processing (exact numbers from the rolling windows) ---
+    series = engine.series(user_id)
+    velocity = series.velocity(as_of)
+    week = velocity["windows"].get("7d") or series.window(7, as_of)
+    impulse_spend = week["impulse"]
+    impulse_label = "/".join(c.title() for c in sorted(IMPULSE_CATEGORIES))
+    longer = "\n".join(
+        f"    Last {w['days']} days: ₹{w['total']} total, ₹{w['impulse']} impulse, "
+        f"{w['count']} transactions, ₹{w['daily_average']}/day"
+        for key, w in velocity["windows"].items() if key != "7d"
     )
-    return response.choices[0].message.content
 
-def generate_trends(transactions):
-    # Filter for the last 7 days (Mocking based on your 2026-01-31 end date)
-    end_date = datetime.strptime("2026-01-31", "%Y-%m-%d")
-    start_date = end_date - timedelta(days=7)
-    
-    weekly_txns = [t for t in transactions if datetime.strptime(t['date'], "%Y-%m-%d") >= start_date]
-    
-    total_week = sum(t['amount'] for t in weekly_txns)
-    # Highlight specific 'impulse' categories like Food and Entertainment
-    impulse_spend = sum(t['amount'] for t in weekly_txns if t['category'] in ['food', 'entertainment', 'shopping'])
-    
     trend_prompt = f"""
-    You are a budget coach. Analyze this week's spending:
-    Total: ₹{total_week}
-    Impulse Spend (Food/Fun/Shop): ₹{impulse_spend}
-    Transaction Count: {len(weekly_txns)}    
+    You are a budget coach. Analyze this week's spending (7 days to {velocity['as_of']}):
+    Total: ₹{week['total']}
+    Impulse Spend ({impulse_label}): ₹{impulse_spend}
+    Transaction Count: {week['count']}
+{longer}
     Summarize the 'Weekly Velocity'. If they spent more than ₹3000 on impulse, be extra harsh.
     """
     
-    response = client.chat.completions.create(
-        model="openrouter/free",
-        messages=[{"role": "user", "content": trend_prompt}]
-    )
-    return response.choices[0].message.content
+    return llm_client.complete([{"role": "user", "content": trend_prompt}])
 if __name__ == "__main__":
     transactions_month = [
         # --- WEEK 1 ---
@@ -162,5 +160,6 @@ if __name__ == "__main__":
         {"amount": 55, "category": "food", "date": "2026-01-31", "description": "Lassi"}
     ]
 
+    record_transactions("demo_user", transactions_month)
     previous_habits_summary = generate_habits(transactions_month)
     print(f"Generated Habit Summary: {previous_habits_summary}")
\ No newline at end of file
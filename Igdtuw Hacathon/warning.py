@@ -1,39 +1,21 @@
-import json
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
-load_dotenv()
-key=os.getenv("KEY")
-# Initialize the client pointing to OpenRouter
-client = OpenAI(
-  base_url="https://openrouter.ai/api/v1",
-  api_key=key,
-)
+import llm_client
+from habit_features import TOKEN_BUDGETS, fit_prompt
+from prompt_registry import registry
 
 def check_financial_health(habits, trend, balance):
-    # 1. Load your structured prompt configuration
-    with open('prompts/prompt_warn.json', 'r') as f:
-        config = json.load(f)
+    # 1. Get the preloaded prompt (validated at import, hot-reloaded on edit)
+    prompt = registry.get("warning")
 
-    # 2. Format the user prompt with the transaction data
-    formatted_user_prompt = config["user_template"].format(
-        previous_spending_habits=habits,
-        latest_transaction_trend=trend,
-        current_bank_balance=balance
-    )
-
-    # 3. Call the model via OpenRouter
-    response = client.chat.completions.create(
-        model="openrouter/free", # High-reliability auto-routing
-        messages=[
-            {"role": "system", "content": config["system_prompt"]},
-            {"role": "user", "content": formatted_user_prompt}
-        ],
-        response_format={ "type": "json_object" }
-    )
+    # 2. Format the user prompt with the transaction data, trimmed to budget
+    messages = prompt.messages(**fit_prompt(
+        prompt, TOKEN_BUDGETS["warning"],
+        fixed={"current_bank_balance": balance},
+        compressible={"previous_spending_habits": habits, "latest_transaction_trend": trend},
+    ))
 
-    # 4. Parse and return the JSON response
-    return json.loads(response.choices[0].message.content)
+    # 3. Call the model via the shared client (cached by prompt) and
+    #    return the parsed JSON response
+    return llm_client.complete_json(messages)
 if __name__ == "__main__":
     # --- Example Usage ---
     student_data = {
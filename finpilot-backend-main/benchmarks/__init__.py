@@ -0,0 +1 @@
+"""Endpoint benchmarks and synthetic data (python -m benchmarks.run --help)."""
@@ -0,0 +1,311 @@
+"""
+Endpoint benchmarks on the in-process memory backend.
+
+Seeds a synthetic dataset, drives every route through the ASGI app (no
+network, no Firestore) and reports throughput, p50/p99 latency and the
+peak Python memory one request allocates. Run from finpilot-backend-main:
+
+    python -m benchmarks.run --size medium
+    python -m benchmarks.run --transactions 250000 --users 200 --json baseline.json
+    python -m benchmarks.run --size medium --compare baseline.json   # exit 1 on regression
+
+Sizes: small (100 transactions), medium (10k), large (100k), xl (1M).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+SIZES = {"small": 100, "medium": 10_000, "large": 100_000, "xl": 1_000_000}
+PASSWORD = "bench-password"
+ADMIN_TOKEN = "bench-admin-token"
+OPERATOR = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+# Routes with no scenario are reported, so new endpoints are not missed
+SKIPPED_ROUTES = {"/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"}
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every API endpoint on synthetic data")
+    parser.add_argument("--size", choices=SIZES, default="small")
+    parser.add_argument("--transactions", type=int, help="Total transactions (overrides --size)")
+    parser.add_argument("--users", type=int, help="Users sharing them (default: 1 per 1000 transactions)")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight per endpoint")
+    parser.add_argument("--only", help="Comma-separated substrings of scenario names to run")
+    parser.add_argument("--no-cache", action="store_true", help="Expire dashboard cache entries immediately")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="Production uses 12")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline results file to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="Fail when p50 or p99 exceeds baseline by this factor")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore latency changes smaller than this")
+    return parser.parse_args(argv)
+
+
+def _configure(args) -> None:
+    # Must run before the app (and config.py) is imported
+    os.environ["STORAGE_BACKEND"] = "memory"
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    # Background checks would compete with the measured requests
+    os.environ["WARNINGS_ENABLED"] = "false"
+    os.environ["SCHEDULER_ENABLED"] = "false"
+    os.environ["ADMIN_TOKEN"] = ADMIN_TOKEN
+    if args.no_cache:
+        os.environ["CACHE_TTL_SECONDS"] = "0"
+
+
+# ── Scenarios ──
+class Context:
+    def __init__(self, user_ids: List[str], emails: List[str], months: List[str]):
+        self.user_ids = user_ids
+        self.emails = emails
+        self.months = months
+        self.tokens: List[str] = []
+        self.run_id: Optional[str] = None
+
+    def user(self, i: int) -> Tuple[str, Dict[str, str]]:
+        k = i % len(self.user_ids)
+        return self.user_ids[k], {"Authorization": f"Bearer {self.tokens[k]}"}
+
+    def month(self, i: int) -> str:
+        return self.months[i % len(self.months)]
+
+
+def _txn(i: int) -> dict:
+    return {"amount": 50 + i % 400, "type": "debit", "category": ("food", "transport", "shopping")[i % 3],
+            "date": f"2025-12-{i % 28 + 1:02d}", "description": "Bench"}
+
+
+def _scenarios() -> List[Tuple[str, str, str, Callable[[Context, int], dict]]]:
+    """(name, method, route path, request kwargs for iteration i)."""
+    from services import session_service
+
+    def auth(ctx, i, **kwargs):
+        _, headers = ctx.user(i)
+        return {"headers": headers, **kwargs}
+
+    return [
+        ("root", "GET", "/", lambda ctx, i: {}),
+        ("dashboard summary", "GET", "/dashboard/summary",
+         lambda ctx, i: auth(ctx, i, params={"month": ctx.month(i)})),
+        ("dashboard warning", "GET", "/dashboard/warning", lambda ctx, i: auth(ctx, i)),
+        ("dashboard category", "GET", "/dashboard/category/{category_name}",
+         lambda ctx, i: auth(ctx, i, url="/dashboard/category/food")),
+        ("history full", "GET", "/dashboard/history", lambda ctx, i: auth(ctx, i)),
+        ("history page", "GET", "/dashboard/history",
+         lambda ctx, i: auth(ctx, i, params={"page_size": 50})),
+        ("history stream", "GET", "/dashboard/history",
+         lambda ctx, i: auth(ctx, i, params={"stream": "true"})),
+        ("wrapped summary", "GET", "/wrapped/summary",
+         lambda ctx, i: auth(ctx, i, params={"year": 2025})),
+        ("cache stats", "GET", "/cache/stats", lambda ctx, i: {"headers": OPERATOR}),
+        ("warning stats", "GET", "/warnings/stats", lambda ctx, i: {"headers": OPERATOR}),
+        ("metrics", "GET", "/metrics", lambda ctx, i: {"headers": OPERATOR}),
+        ("startup stats", "GET", "/startup/stats", lambda ctx, i: {"headers": OPERATOR}),
+        ("jobs status", "GET", "/jobs", lambda ctx, i: {"headers": OPERATOR}),
+        ("job run status", "GET", "/jobs/runs/{run_id}",
+         lambda ctx, i: {"url": f"/jobs/runs/{ctx.run_id}", "headers": OPERATOR}),
+        ("job enqueue", "POST", "/jobs/{name}/run",
+         lambda ctx, i: {"url": "/jobs/health_warning/run", "headers": OPERATOR,
+                         "json": {"kwargs": {"user_id": ctx.user(i)[0], "as_of": "2025-12-31"}}}),
+        ("add transaction", "POST", "/transactions", lambda ctx, i: auth(ctx, i, json=_txn(i))),
+        ("transaction batch x100", "POST", "/transactions/batch",
+         lambda ctx, i: auth(ctx, i, json={"transactions": [_txn(i * 100 + k) for k in range(100)]})),
+        ("set salary", "POST", "/salary",
+         lambda ctx, i: auth(ctx, i, json={"amount": 45000, "month": ctx.month(i)})),
+        ("salary batch x100", "POST", "/salary/batch",
+         lambda ctx, i: {"headers": OPERATOR, "json": {"salaries": [
+             {"user_id": ctx.user(i * 100 + k)[0], "amount": 40000 + k, "month": ctx.month(k)}
+             for k in range(100)
+         ]}}),
+        ("savings goal", "POST", "/savings/goal",
+         lambda ctx, i: auth(ctx, i, json={"target_amount": 10000 + i, "duration_months": 12 + i % 24})),
+        ("register", "POST", "/auth/register",
+         lambda ctx, i: {"json": {"email": f"new{i}-{time.time_ns()}@bench.finpilot",
+                                  "password": PASSWORD, "name": "New User"}}),
+        ("login", "POST", "/auth/login",
+         lambda ctx, i: {"json": {"email": ctx.emails[i % len(ctx.emails)], "password": PASSWORD}}),
+        # Each logout revokes a token of its own
+        ("logout", "POST", "/auth/logout",
+         lambda ctx, i: {"headers": {"Authorization": f"Bearer {session_service.issue_token(ctx.user(i)[0])[0]}"}}),
+    ]
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+async def _measure(client, method: str, path: str, build, ctx: Context, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        kwargs = build(ctx, i)
+        url = kwargs.pop("url", path)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    # Separate, short pass for memory: tracemalloc would distort the timings
+    tracemalloc.start()
+    peak = 0
+    for i in range(min(5, requests)):
+        kwargs = build(ctx, requests + i)
+        url = kwargs.pop("url", path)
+        tracemalloc.reset_peak()
+        await client.request(method, url, **kwargs)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def _uncovered_routes(app, scenarios) -> List[str]:
+    covered = {(method, path) for _, method, path, _ in scenarios}
+    missing = []
+    for route in app.routes:
+        if route.path in SKIPPED_ROUTES:
+            continue
+        for method in sorted(getattr(route, "methods", None) or ()):
+            if method != "HEAD" and (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run(args) -> dict:
+    import httpx
+    from main import app
+    from services import hashing_service, session_service
+    from services.scheduler_service import scheduler
+    from storage import set_storage
+    from storage.sqlite_backend import SQLiteStorage
+    from benchmarks.synthetic import SyntheticDataset, seed_storage
+
+    total = args.transactions or SIZES[args.size]
+    users = args.users or max(1, min(total // 1000, 1000))
+    dataset = SyntheticDataset(total, users, args.months, args.seed)
+
+    storage = SQLiteStorage(":memory:")
+    set_storage(storage)
+    started = time.perf_counter()
+    user_ids = seed_storage(storage, dataset, hashing_service.hash_password(PASSWORD))
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded {total:,} transactions for {users:,} users in {seed_seconds:.1f}s")
+
+    ctx = Context(user_ids, [p["email"] for p in dataset.profiles], dataset.months)
+    ctx.tokens = [session_service.issue_token(user_id)[0] for user_id in user_ids]
+    ctx.run_id = scheduler.enqueue("health_warning", user_id=user_ids[0], as_of="2025-12-31")["id"]
+
+    scenarios = _scenarios()
+    for route in _uncovered_routes(app, scenarios):
+        print(f"warning: no benchmark scenario for {route}")
+    if args.only:
+        wanted = [w.strip() for w in args.only.split(",")]
+        scenarios = [s for s in scenarios if any(w in s[0] for w in wanted)]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, path, build in scenarios:
+            results[name] = await _measure(client, method, path, build, ctx, args.requests, args.concurrency)
+            print(f"  {name:<24} {results[name]['p50_ms']:>9.2f} ms p50", flush=True)
+
+    return {
+        "dataset": {"transactions": total, "users": users, "months": args.months, "seed": args.seed,
+                    "seed_seconds": round(seed_seconds, 2)},
+        "settings": {"requests": args.requests, "concurrency": args.concurrency,
+                     "cache": not args.no_cache, "bcrypt_rounds": args.bcrypt_rounds},
+        "peak_rss_mb": _peak_rss_mb(),
+        "endpoints": results,
+    }
+
+
+def _print_report(report: dict) -> None:
+    header = f"{'endpoint':<24} {'req':>6} {'err':>5} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak KB':>10}"
+    print("\n" + header + "\n" + "-" * len(header))
+    for name, r in report["endpoints"].items():
+        print(f"{name:<24} {r['requests']:>6} {r['errors']:>5} {r['throughput_rps']:>10.1f} "
+              f"{r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {r['peak_mem_kb']:>10.1f}")
+    if report["peak_rss_mb"] is not None:
+        print(f"\nProcess peak RSS: {report['peak_rss_mb']} MB")
+
+
+def _regressions(report: dict, baseline: dict, factor: float, min_delta_ms: float) -> List[str]:
+    found = []
+    if baseline.get("dataset") != report["dataset"]:
+        print("note: baseline was recorded on a different dataset; comparing anyway")
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            before, after = previous[metric], current[metric]
+            if after > before * factor and after - before >= min_delta_ms:
+                found.append(f"{name}: {metric} {before:.2f} -> {after:.2f} ({after / before:.2f}x)")
+        if current["errors"] > previous["errors"]:
+            found.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return found
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    _configure(args)
+    report = asyncio.run(_run(args))
+    _print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = _regressions(report, json.load(f), args.max_regression, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Serialization cost per endpoint, separate from the time spent reading data.
+
+Builds each endpoint's payload once on the memory backend, then times the
+ways it can leave the app:
+
+- default: response_model validation (where the route has one), FastAPI's
+  jsonable_encoder and JSONResponse, i.e. what runs with FAST_JSON off
+- fast: FastJSONResponse straight from the service's data (FAST_JSON on)
+- gzip: compressing the rendered body at GZIP_LEVEL
+
+Run from finpilot-backend-main:
+
+    python -m benchmarks.serialization --size medium
+    python -m benchmarks.serialization --transactions 50000 --users 5
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import time
+from typing import Callable, List, Optional
+
+from benchmarks.run import SIZES
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time response serialization per endpoint")
+    parser.add_argument("--size", choices=SIZES, default="medium")
+    parser.add_argument("--transactions", type=int, help="Total transactions (overrides --size)")
+    parser.add_argument("--users", type=int, help="Users sharing them (default: 1 per 1000 transactions)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per endpoint")
+    return parser.parse_args(argv)
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    # Best of N: the floor is the cost itself, the rest is noise
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def _payloads(user_id: str, category: str, month: str) -> List[tuple]:
+    """(name, response model or None, payload) as each route would send it."""
+    from services import finance_service, wrapped_service
+    from schemas.transaction import DashboardSummaryResponse
+    from schemas.wrapped import WrappedSummaryResponse
+
+    history = await finance_service.get_full_history_async(user_id)
+    category_page = await finance_service.get_category_transactions_async(user_id, category)
+    return [
+        ("history full", None, history["items"]),
+        ("history page", None, await finance_service.get_history_page_async(user_id, 50)),
+        ("dashboard category", None, category_page["items"]),
+        ("wrapped summary", WrappedSummaryResponse,
+         await wrapped_service.get_wrapped_summary_async(user_id, int(month[:4]))),
+        ("dashboard summary", DashboardSummaryResponse,
+         await finance_service.get_dashboard_summary_async(user_id, month)),
+    ]
+
+
+def _default_path(model: Optional[type], payload) -> Callable[[], bytes]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    if model is None:
+        return lambda: JSONResponse(jsonable_encoder(payload)).body
+    adapter = TypeAdapter(model)
+    return lambda: JSONResponse(jsonable_encoder(adapter.validate_python(payload))).body
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # Must run before the app (and config.py) is imported
+    os.environ["STORAGE_BACKEND"] = "memory"
+    os.environ["BCRYPT_ROUNDS"] = "4"
+    os.environ["WARNINGS_ENABLED"] = "false"
+    os.environ["SCHEDULER_ENABLED"] = "false"
+
+    from config import GZIP_LEVEL
+    from responses import FastJSONResponse, orjson
+    from services import hashing_service
+    from storage import set_storage
+    from storage.sqlite_backend import SQLiteStorage
+    from benchmarks.synthetic import SyntheticDataset, seed_storage
+
+    total = args.transactions or SIZES[args.size]
+    users = args.users or max(1, min(total // 1000, 1000))
+    dataset = SyntheticDataset(total, users, 12, args.seed)
+    storage = SQLiteStorage(":memory:")
+    set_storage(storage)
+    user_ids = seed_storage(storage, dataset, hashing_service.hash_password("bench-password"))
+    print(f"Seeded {total:,} transactions for {users:,} users; timing user 0 "
+          f"(fast path: {'orjson' if orjson is not None else 'json module, orjson not installed'})")
+
+    header = (f"{'endpoint':<20} {'bytes':>10} {'gzipped':>9} {'default ms':>11} "
+              f"{'fast ms':>9} {'speedup':>8} {'gzip ms':>9}")
+    print("\n" + header + "\n" + "-" * len(header))
+    for name, model, payload in asyncio.run(_payloads(user_ids[0], "food", dataset.months[-1])):
+        default = _default_path(model, payload)
+        body = default()
+        compressed = gzip.compress(body, GZIP_LEVEL)
+        default_ms = _best_ms(default, args.repeat)
+        fast_ms = _best_ms(lambda: FastJSONResponse(payload).body, args.repeat)
+        gzip_ms = _best_ms(lambda: gzip.compress(body, GZIP_LEVEL), args.repeat)
+        print(f"{name:<20} {len(body):>10,} {len(compressed):>9,} {default_ms:>11.3f} "
+              f"{fast_ms:>9.3f} {default_ms / fast_ms:>7.1f}x {gzip_ms:>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
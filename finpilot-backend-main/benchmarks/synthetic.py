@@ -0,0 +1,134 @@
+"""
+Seeded synthetic users and transactions for benchmarks and load tests.
+
+The same seed always yields the same data: users with lognormal incomes,
+a monthly salary credit and rent debit each, and day-to-day spending drawn
+from per-category frequency weights and lognormal amounts.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+# category -> (share of day-to-day transactions, median amount in ₹, lognormal sigma, merchants)
+CATEGORIES: Dict[str, Tuple[float, float, float, Tuple[str, ...]]] = {
+    "food": (0.38, 180, 0.8, ("Swiggy", "Zomato", "Canteen", "Chai Point", "BigBasket", "Dhaba")),
+    "transport": (0.20, 90, 0.7, ("Metro", "Uber", "Rapido", "Auto Rickshaw", "Ola")),
+    "shopping": (0.10, 900, 0.9, ("Myntra", "Amazon", "Flipkart", "Decathlon")),
+    "entertainment": (0.08, 350, 0.7, ("BookMyShow", "Netflix", "Spotify", "Bowling")),
+    "utilities": (0.07, 700, 0.5, ("Electricity Bill", "WiFi Bill", "Mobile Recharge")),
+    "health": (0.04, 500, 0.8, ("Pharmacy", "Clinic", "Lab Test")),
+    "misc": (0.13, 200, 1.0, ("Stationery", "Xerox", "Gift", "Laundry")),
+}
+
+MEDIAN_INCOME = 40000
+RENT_SHARE = 0.3
+END_DATE = date(2025, 12, 31)
+
+
+def _months_back(end: date, count: int) -> List[str]:
+    months, year, month = [], end.year, end.month
+    for _ in range(count):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+class SyntheticDataset:
+    """
+    `transactions` in total over `users` users and `months` months ending
+    at END_DATE. Recurring rows (salary, rent) count towards the total.
+    """
+
+    def __init__(self, transactions: int, users: int, months: int = 12, seed: int = 42):
+        if users < 1 or transactions < users:
+            raise ValueError("Need at least one user and one transaction per user")
+        self.transactions = transactions
+        self.users = users
+        self.months = _months_back(END_DATE, months)
+        self.seed = seed
+        rng = random.Random(seed)
+        self.profiles = [
+            {
+                "index": i,
+                "email": f"user{i}@bench.finpilot",
+                "name": f"Bench User {i}",
+                "income": round(MEDIAN_INCOME * rng.lognormvariate(0, 0.4), -2),
+            }
+            for i in range(users)
+        ]
+
+    def user_transactions(self, index: int) -> Iterator[dict]:
+        """All of one user's transactions (user_id left for the caller to fill)."""
+        profile = self.profiles[index]
+        rng = random.Random(self.seed * 1_000_003 + index)
+        count = self.transactions // self.users + (1 if index < self.transactions % self.users else 0)
+
+        # Salary and rent each month, as long as the user's share allows
+        recurring = []
+        for month in self.months:
+            recurring.append({"amount": profile["income"], "type": "credit", "category": "salary",
+                              "date": f"{month}-01", "description": "Salary"})
+            recurring.append({"amount": round(profile["income"] * RENT_SHARE, -2), "type": "debit",
+                              "category": "rent", "date": f"{month}-01", "description": "Monthly Rent"})
+        yield from recurring[:count]
+
+        first_day = date.fromisoformat(f"{self.months[0]}-01")
+        span = (END_DATE - first_day).days + 1
+        names = list(CATEGORIES)
+        weights = [CATEGORIES[c][0] for c in names]
+        for _ in range(max(count - len(recurring), 0)):
+            category = rng.choices(names, weights)[0]
+            _, median, sigma, merchants = CATEGORIES[category]
+            yield {
+                "amount": round(median * rng.lognormvariate(0, sigma), 2),
+                "type": "debit",
+                "category": category,
+                "date": (first_day + timedelta(days=rng.randrange(span))).isoformat(),
+                "description": rng.choice(merchants),
+            }
+
+    def salaries(self) -> Iterator[dict]:
+        for profile in self.profiles:
+            for month in self.months:
+                yield {"index": profile["index"], "month": month, "amount": profile["income"]}
+
+
+def seed_storage(storage, dataset: SyntheticDataset, password_hash: str, chunk_size: int = 5000) -> List[str]:
+    """
+    Writes the dataset through the StorageBackend interface (users sharing
+    `password_hash`, salaries with allocations, one goal each, transactions
+    in batches). Returns the user IDs, in profile order.
+    """
+    from services.allocation_service import get_profiles
+    from services.projection_service import project_goal
+
+    user_ids = [
+        storage.create_user({"email": p["email"], "name": p["name"], "password_hash": password_hash})
+        for p in dataset.profiles
+    ]
+
+    salaries = list(dataset.salaries())
+    allocations = get_profiles().allocate([s["amount"] for s in salaries], [None] * len(salaries))
+    storage.set_salaries([
+        {"user_id": user_ids[s["index"]], "month": s["month"], "amount": s["amount"], "categories": categories}
+        for s, categories in zip(salaries, allocations)
+    ])
+
+    for user_id, profile in zip(user_ids, dataset.profiles):
+        target = round(profile["income"] * 3, -2)
+        projection = project_goal(target, 12)
+        storage.add_goal({
+            "user_id": user_id, "target_amount": target, "duration_months": 12,
+            **{k: projection[k] for k in ("plan", "suggestion", "monthly_amount", "expected_return")},
+        })
+
+    chunk: List[dict] = []
+    for index, user_id in enumerate(user_ids):
+        for txn in dataset.user_transactions(index):
+            chunk.append({**txn, "user_id": user_id})
+            if len(chunk) >= chunk_size:
+                storage.add_transactions(chunk)
+                chunk = []
+    if chunk:
+        storage.add_transactions(chunk)
+    return user_ids
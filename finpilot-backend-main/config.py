@@ -1,8 +1,101 @@
 import os
+import secrets
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # In a real app, use os.getenv("FIREBASE_CREDENTIALS_PATH")
 # For this hackathon setup, we assume the file is in the root
-CREDENTIALS_PATH = "serviceAccountKey.json"
\ No newline at end of file
+CREDENTIALS_PATH = "serviceAccountKey.json"
+
+# Storage backend: "firestore" (default), "sqlite" (file at SQLITE_PATH)
+# or "memory" (in-process SQLite, no network, for load tests and benchmarks)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "finpilot.db")
+
+# Firebase is initialized during startup (database.py). With
+# FIRESTORE_WARMUP=true startup also opens the gRPC channels (one read of a
+# missing document per client) so the first request skips that handshake.
+FIRESTORE_WARMUP = os.getenv("FIRESTORE_WARMUP", "false").lower() == "true"
+FIRESTORE_WARMUP_TIMEOUT = float(os.getenv("FIRESTORE_WARMUP_TIMEOUT", "10"))
+
+
+# Per-process read-through cache for dashboard reads (services/cache_service.py)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+# Upper bound on POST /transactions/batch (committed in 500-op Firestore batches)
+MAX_BATCH_TRANSACTIONS = int(os.getenv("MAX_BATCH_TRANSACTIONS", "5000"))
+
+# Password hashing (services/hashing_service.py). bcrypt runs in its own
+# process pool; requests beyond HASH_MAX_PENDING are rejected with 503.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", str(HASH_WORKERS * 8)))
+
+# Signed session tokens (services/session_service.py). Set SESSION_SECRET in
+# production: the random fallback differs per process and per restart.
+SESSION_SECRET = os.getenv("SESSION_SECRET") or secrets.token_urlsafe(32)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+REVOKED_TOKEN_CACHE_SIZE = int(os.getenv("REVOKED_TOKEN_CACHE_SIZE", "10000"))
+# While false, requests without a token may still identify themselves with
+# a user_id field (the pre-token API); a token, when sent, always wins.
+REQUIRE_SESSION_TOKEN = os.getenv("REQUIRE_SESSION_TOKEN", "false").lower() == "true"
+# Operator credential ("Authorization: Bearer <token>") for /jobs, the salary
+# batch, /metrics and the /*/stats routes. Unset, those routes answer 403.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+# Email lookups go through the user_emails index. Users registered before it
+# existed are found by a query on users.email until the one-off
+# backfill_email_index job has indexed them; then set this to false so
+# registration and unknown-email logins stop running that query.
+EMAIL_INDEX_FALLBACK = os.getenv("EMAIL_INDEX_FALLBACK", "true").lower() == "true"
+
+# Budget allocation profiles (services/allocation_service.py): a JSON object
+# of profile name -> {category: share of salary}, shares summing to 1
+ALLOCATION_PROFILES_PATH = os.getenv(
+    "ALLOCATION_PROFILES_PATH", os.path.join(os.path.dirname(__file__), "allocation_profiles.json")
+)
+DEFAULT_ALLOCATION_PROFILE = os.getenv("DEFAULT_ALLOCATION_PROFILE", "standard")
+MAX_BATCH_SALARIES = int(os.getenv("MAX_BATCH_SALARIES", "10000"))
+
+# Savings goal projections (services/projection_service.py)
+MONTE_CARLO_SIMULATIONS = int(os.getenv("MONTE_CARLO_SIMULATIONS", "2000"))
+PROJECTION_CACHE_SIZE = int(os.getenv("PROJECTION_CACHE_SIZE", "1024"))
+
+# Financial-health warnings (services/warning_service.py), evaluated in the
+# background after transaction writes. At most one evaluation per user per
+# WARNING_DEBOUNCE_SECONDS; writes arriving within WARNING_SETTLE_SECONDS of
+# each other (or while one is pending) are coalesced into that evaluation.
+WARNINGS_ENABLED = os.getenv("WARNINGS_ENABLED", "true").lower() == "true"
+WARNING_DEBOUNCE_SECONDS = float(os.getenv("WARNING_DEBOUNCE_SECONDS", "60"))
+WARNING_SETTLE_SECONDS = float(os.getenv("WARNING_SETTLE_SECONDS", "2"))
+WARNING_WORKERS = int(os.getenv("WARNING_WORKERS", "2"))
+
+# Background jobs (services/scheduler_service.py): cron schedules and
+# on-demand runs share SCHEDULER_WORKERS threads; at most SCHEDULER_MAX_QUEUE
+# runs may wait. Cron expressions are in the server's local time.
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+SCHEDULER_MAX_QUEUE = int(os.getenv("SCHEDULER_MAX_QUEUE", "1000"))
+SCHEDULER_HISTORY = int(os.getenv("SCHEDULER_HISTORY", "200"))
+WRAPPED_PRECOMPUTE_CRON = os.getenv("WRAPPED_PRECOMPUTE_CRON", "30 2 * * *")
+
+# Response encoding (responses.py). FAST_JSON=true renders JSON with orjson
+# (when installed; the standard library otherwise) and sends payloads the
+# services built themselves (summary, category, history, wrapped) without
+# re-validating them against their response models. Responses of at least
+# GZIP_MIN_SIZE bytes are gzip-compressed for clients that accept it,
+# except the NDJSON history stream (middleware.SelectiveGZipMiddleware); 0
+# turns compression off.
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+
+# Per-request read budget (services/read_budget_service.py), in documents
+# read (Firestore documents, SQLite rows). Past READ_BUDGET_SOFT a structured
+# warning is logged; history and category responses stop at READ_BUDGET_HARD
+# with a continuation cursor, and any other request crossing it is rejected.
+# 0 turns a limit off. Background jobs are not budgeted.
+READ_BUDGET_SOFT = int(os.getenv("READ_BUDGET_SOFT", "2000"))
+READ_BUDGET_HARD = int(os.getenv("READ_BUDGET_HARD", "10000"))
@@ -1,11 +1,21 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-from config import CREDENTIALS_PATH
+import asyncio
 import os
 import sys
+import threading
+from config import CREDENTIALS_PATH, FIRESTORE_WARMUP_TIMEOUT
+from services import startup_service
 
-# Check if credentials file exists
-if not os.path.exists(CREDENTIALS_PATH):
+# Firebase is initialized lazily and once: by the app's lifespan startup
+# (main.py), or by the first `from database import db` in a script. Importing
+# this module alone does no work.
+
+_clients = None
+_lock = threading.Lock()
+
+
+def _check_credentials():
+    if os.path.exists(CREDENTIALS_PATH):
+        return
     print("\n" + "="*70)
     print("❌ FIREBASE CREDENTIALS NOT FOUND!")
     print("="*70)
@@ -22,25 +32,74 @@ if not os.path.exists(CREDENTIALS_PATH):
     print("="*70 + "\n")
     sys.exit(1)
 
-# Initialize Firebase Admin SDK
-try:
-    if not firebase_admin._apps:
-        cred = credentials.Certificate(CREDENTIALS_PATH)
-        firebase_admin.initialize_app(cred)
-    
-    # Export the Firestore client
-    db = firestore.client()
-    print("✅ Firebase connected successfully!")
-    
-except Exception as e:
-    print("\n" + "="*70)
-    print("❌ FIREBASE INITIALIZATION FAILED!")
-    print("="*70)
-    print(f"\nError: {str(e)}")
-    print("\n🔧 Possible issues:")
-    print("   - Invalid service account key file")
-    print("   - Firestore not enabled in Firebase Console")
-    print("   - Network connectivity issues")
-    print("\n💡 Tip: Check your Firebase project settings")
-    print("="*70 + "\n")
-    sys.exit(1)
\ No newline at end of file
+
+def _connect():
+    _check_credentials()
+    try:
+        with startup_service.phase("import: firebase"):
+            import firebase_admin
+            from firebase_admin import credentials, firestore, firestore_async
+            from storage.instrumented_client import InstrumentedClient
+
+        with startup_service.phase("init: firebase"):
+            if not firebase_admin._apps:
+                cred = credentials.Certificate(CREDENTIALS_PATH)
+                firebase_admin.initialize_app(cred)
+
+            # The Firestore clients (sync for scripts/jobs, async for routes),
+            # wrapped so queries, reads and writes show up on /metrics
+            clients = (
+                InstrumentedClient(firestore.client()),
+                InstrumentedClient(firestore_async.client()),
+            )
+        print("✅ Firebase connected successfully!")
+        return clients
+
+    except Exception as e:
+        print("\n" + "="*70)
+        print("❌ FIREBASE INITIALIZATION FAILED!")
+        print("="*70)
+        print(f"\nError: {str(e)}")
+        print("\n🔧 Possible issues:")
+        print("   - Invalid service account key file")
+        print("   - Firestore not enabled in Firebase Console")
+        print("   - Network connectivity issues")
+        print("\n💡 Tip: Check your Firebase project settings")
+        print("="*70 + "\n")
+        sys.exit(1)
+
+
+def init():
+    """
+    Returns (db, async_db), initializing Firebase on the first call only.
+    """
+    global _clients
+    if _clients is None:
+        with _lock:
+            if _clients is None:
+                _clients = _connect()
+    return _clients
+
+
+async def warm_up():
+    """
+    Opens both clients' gRPC channels (one lookup of a missing document
+    each), so the first request does not pay for the connection.
+    Must run on the event loop that will serve requests.
+    """
+    db, async_db = init()
+    # No retries and a deadline, so an unreachable Firestore cannot hold up startup
+    options = {"retry": None, "timeout": FIRESTORE_WARMUP_TIMEOUT}
+    await asyncio.gather(
+        asyncio.to_thread(lambda: db.collection("_warmup").document("ping").get(**options)),
+        async_db.collection("_warmup").document("ping").get(**options),
+    )
+
+
+def __getattr__(name):
+    # `from database import db` keeps working and initializes on first use
+    if name == "db":
+        return init()[0]
+    if name == "async_db":
+        return init()[1]
+    raise AttributeError(f"module 'database' has no attribute '{name}'")
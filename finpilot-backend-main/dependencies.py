@@ -0,0 +1,66 @@
+import secrets
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Query
+from config import ADMIN_TOKEN, REQUIRE_SESSION_TOKEN
+from services.metrics_service import tag_user
+from services.session_service import InvalidToken, verify_token
+
+_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+
+def bearer_token(authorization: Optional[str] = Header(None)) -> Optional[str]:
+    """The raw token from an "Authorization: Bearer <token>" header, if any."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise HTTPException(status_code=401, detail="Expected a Bearer session token", headers=_CHALLENGE)
+    return token.strip()
+
+
+def session_user_id(token: Optional[str] = Depends(bearer_token)) -> Optional[str]:
+    """
+    User ID from the session token, verified locally (no database read).
+    None when no token was sent and REQUIRE_SESSION_TOKEN is off.
+    """
+    if token is None:
+        if REQUIRE_SESSION_TOKEN:
+            raise HTTPException(status_code=401, detail="Missing session token", headers=_CHALLENGE)
+        return None
+    try:
+        return verify_token(token)
+    except InvalidToken as e:
+        raise HTTPException(status_code=401, detail=str(e), headers=_CHALLENGE)
+
+
+def authorize(claimed_user_id: Optional[str], session_user: Optional[str]) -> str:
+    """
+    Resolves the user a request acts for. With a session the token decides,
+    and a user_id naming someone else is rejected; without one the legacy
+    user_id field is trusted.
+    """
+    if session_user is None:
+        if not claimed_user_id:
+            raise HTTPException(status_code=401, detail="Missing session token", headers=_CHALLENGE)
+        tag_user(claimed_user_id)
+        return claimed_user_id
+    if claimed_user_id and claimed_user_id != session_user:
+        raise HTTPException(status_code=403, detail="user_id does not match the session")
+    tag_user(session_user)
+    return session_user
+
+
+def current_user_id(
+    user_id: Optional[str] = Query(None),
+    session_user: Optional[str] = Depends(session_user_id),
+) -> str:
+    """For routes that take user_id as a query parameter."""
+    return authorize(user_id, session_user)
+
+
+def require_admin(token: Optional[str] = Depends(bearer_token)) -> None:
+    """For operator routes: the request must carry ADMIN_TOKEN as its Bearer token."""
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=403, detail="Operator routes are disabled (ADMIN_TOKEN is not set)")
+    if token is None or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid operator token", headers=_CHALLENGE)
@@ -1,8 +1,55 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from routers import salary, dashboard, goals, auth, wrapped
+from services import startup_service  # first, so the startup clock covers every import
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Finance AI Backend")
+with startup_service.phase("import: fastapi"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+with startup_service.phase("import: routers"):
+    from config import FAST_JSON, FIRESTORE_WARMUP, GZIP_LEVEL, GZIP_MIN_SIZE, SCHEDULER_ENABLED, STORAGE_BACKEND
+    from middleware import MetricsMiddleware, SelectiveGZipMiddleware
+    from responses import FastJSONResponse
+    from routers import salary, dashboard, goals, auth, wrapped, system, jobs
+    from services import hashing_service
+    from services.scheduler_service import scheduler
+    from storage import get_async_storage, get_storage
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are created here, before the app reports ready, rather than
+    # by the first request to need them
+    if STORAGE_BACKEND == "firestore":
+        import database
+        database.init()
+        if FIRESTORE_WARMUP:
+            with startup_service.phase("warm-up: firestore"):
+                try:
+                    await database.warm_up()
+                except Exception as e:
+                    # Not fatal: the first request opens the channel instead
+                    print(f"⚠️ Firestore warm-up failed: {type(e).__name__}: {e}")
+    with startup_service.phase("init: storage"):
+        get_storage()
+        get_async_storage()
+    with startup_service.phase("init: hashing pool"):
+        hashing_service.start()
+
+    # Cron schedules fire only while the server runs; queued jobs need no start
+    if SCHEDULER_ENABLED:
+        with startup_service.phase("init: scheduler"):
+            scheduler.start()
+    startup_service.mark_ready()
+    yield
+    scheduler.shutdown()
+    hashing_service.shutdown()
+
+app = FastAPI(
+    title="Finance AI Backend",
+    lifespan=lifespan,
+    # Routes with a response_model still validate, but render through orjson
+    default_response_class=FastJSONResponse if FAST_JSON else JSONResponse,
+)
 
 # CORS Setup (Allowing all for hackathon convenience)
 app.add_middleware(
@@ -11,14 +58,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if GZIP_MIN_SIZE:
+    app.add_middleware(
+        SelectiveGZipMiddleware, exclude=dashboard.is_history_stream,
+        minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL,
+    )
+
+# Added last so it wraps everything, CORS preflights and compression included
+app.add_middleware(MetricsMiddleware)
+
 # Include Routers
 app.include_router(auth.router)
 app.include_router(salary.router)
 app.include_router(dashboard.router)
 app.include_router(goals.router)
 app.include_router(wrapped.router)
+app.include_router(system.router)
+app.include_router(jobs.router)
 
 @app.get("/")
 def root():
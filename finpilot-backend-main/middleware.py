@@ -0,0 +1,69 @@
+import time
+from typing import Callable
+from starlette.middleware.gzip import GZipMiddleware
+from services import metrics_service as metrics
+from services.read_budget_service import ReadBudget
+
+
+class MetricsMiddleware:
+    """
+    Records latency, in-flight count, status and errors per route template,
+    plus the database work each request did (see metrics_service.record_db),
+    and gives each request its read budget. Plain ASGI, so streaming
+    responses are timed (and budgeted) until their last byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.RequestStats(scope)
+        stats.budget = ReadBudget()
+        token = metrics.current_request.set(stats)
+        status = 500
+        metrics.in_flight.inc()
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight.dec()
+            metrics.current_request.reset(token)
+            route, method = stats.route, scope["method"]
+            metrics.requests_total.inc(method, route, str(status))
+            metrics.request_latency.observe(method, route, value=elapsed)
+            if status >= 500:
+                metrics.request_errors.inc(method, route)
+            metrics.finish_request(stats)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that passes the requests `exclude(scope)` picks out
+    through untouched, for streams whose rows must not wait in the
+    compressor's buffer.
+    """
+
+    def __init__(self, app, exclude: Callable[[dict], bool], **options):
+        super().__init__(app, **options)
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.exclude(scope):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
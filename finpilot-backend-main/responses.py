@@ -0,0 +1,37 @@
+import json
+from typing import Any, Dict, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from config import FAST_JSON
+
+try:
+    import orjson
+except ImportError:  # optional: FastJSONResponse falls back to the json module
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Compact JSON rendered by orjson when it is installed, json.dumps
+    otherwise. Values JSON has no type for (dates, Decimals) become strings,
+    as in the NDJSON history stream.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_json(content: Any, response: Optional[Response] = None, headers: Optional[Dict[str, str]] = None):
+    """
+    Sends a payload the service built itself. With FAST_JSON on it goes out
+    as a FastJSONResponse directly, skipping response_model validation and
+    FastAPI's encoder pass; otherwise it is returned for the usual path,
+    with `headers` set on the route's injected `response`.
+    """
+    if FAST_JSON:
+        return FastJSONResponse(content, headers=headers)
+    if headers and response is not None:
+        response.headers.update(headers)
+    return content
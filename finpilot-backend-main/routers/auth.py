@@ -1,23 +1,47 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from dependencies import bearer_token
 from schemas.auth import UserRegister, UserLogin, UserResponse
 from services import auth_service
+from services.hashing_service import HashingBusy
+from services.read_budget_service import ReadBudgetExceeded
 
 router = APIRouter(tags=["Authentication"])
 
 @router.post("/auth/register", response_model=UserResponse)
-def register(user: UserRegister):
+async def register(user: UserRegister):
     try:
-        return auth_service.register_user(user)
+        return await auth_service.register_user_async(user)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HashingBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/auth/login", response_model=UserResponse)
-def login(creds: UserLogin):
+async def login(creds: UserLogin):
     try:
-        return auth_service.login_user(creds)
+        return await auth_service.login_user_async(creds)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HashingBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e)) # 401 = Unauthorized
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/logout")
+def logout(token: Optional[str] = Depends(bearer_token)):
+    """
+    Revokes the session token sent in the Authorization header.
+    """
+    if token is None:
+        raise HTTPException(status_code=401, detail="Missing session token")
+    try:
+        return auth_service.logout_user(token)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
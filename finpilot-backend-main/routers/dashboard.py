@@ -1,37 +1,156 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from schemas.transaction import TransactionInput, DashboardSummaryResponse
-from services import finance_service
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import List, Optional
+from urllib.parse import parse_qs
+from schemas.transaction import (
+    TransactionInput, TransactionBatchInput, TransactionBatchResponse, DashboardSummaryResponse, HealthWarningResponse,
+)
+from services import finance_service, warning_service
+from services.read_budget_service import ReadBudgetExceeded
+from dependencies import authorize, current_user_id, session_user_id
+from responses import fast_json
 
 router = APIRouter(tags=["Dashboard"])
 
+def _iso(day: Optional[date]) -> Optional[str]:
+    # Query dates are parsed strictly ("2026-2-1" is a 422), then compared as
+    # the zero-padded strings transactions are stored with
+    return day.isoformat() if day is not None else None
+
+def is_history_stream(scope: dict) -> bool:
+    """
+    True for GET /dashboard/history?stream=true, which main.py keeps out of
+    gzip: compression would hold rows back until the compressor's buffer
+    fills, defeating the stream. Reads the flag as FastAPI does (last value).
+    """
+    if scope["path"] != "/dashboard/history":
+        return False
+    values = parse_qs(scope["query_string"].decode("latin-1")).get("stream")
+    return bool(values) and values[-1].lower() in ("1", "on", "t", "true", "y", "yes")
+
+def _items(page: dict, response: Response):
+    # A list cut short by the read budget says where to continue in a header
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else None
+    return fast_json(page["items"], response, headers)
+
 @router.post("/transactions")
-def add_transaction(data: TransactionInput):
+async def add_transaction(data: TransactionInput, session_user: Optional[str] = Depends(session_user_id)):
+    data.user_id = authorize(data.user_id, session_user)
+    try:
+        return await finance_service.add_transaction_async(data)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/transactions/batch", response_model=TransactionBatchResponse)
+async def add_transactions_batch(data: TransactionBatchInput, session_user: Optional[str] = Depends(session_user_id)):
+    """
+    Bulk import. Rows are validated individually (a row without a user_id,
+    or naming someone other than the session's user, fails on its own) and
+    committed in batched writes; the response reports an ID or an error for
+    every input position.
+    """
     try:
-        return finance_service.add_transaction(data)
+        return await finance_service.add_transactions_batch_async(data.transactions, session_user)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/dashboard/summary", response_model=DashboardSummaryResponse)
-def get_summary(user_id: str, month: str):
+async def get_summary(
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    user_id: str = Depends(current_user_id),
+):
     """
     Month format: 'YYYY-MM' (e.g., '2026-02')
     """
     try:
-        return finance_service.get_dashboard_summary(user_id, month)
+        return fast_json(await finance_service.get_dashboard_summary_async(user_id, month))
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/dashboard/warning", response_model=HealthWarningResponse)
+async def get_health_warning(user_id: str = Depends(current_user_id)):
+    """
+    Latest financial-health check. Checks run in the background after
+    transaction writes (at most one per user per WARNING_DEBOUNCE_SECONDS),
+    so this can trail the newest transactions briefly.
+    """
+    try:
+        return await warning_service.get_warning_async(user_id) or {}
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/dashboard/category/{category_name}")
-def get_category_details(user_id: str, category_name: str):
+async def get_category_details(
+    category_name: str,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    cursor: Optional[str] = None,
+    user_id: str = Depends(current_user_id),
+):
+    """
+    Optional date window: start inclusive, end exclusive ('YYYY-MM-DD').
+    When the list reaches the per-request read budget it is cut short and
+    an X-Next-Cursor header carries the cursor to pass back for the rest.
+    """
     try:
-        return finance_service.get_category_transactions(user_id, category_name)
+        page = await finance_service.get_category_transactions_async(
+            user_id, category_name, _iso(start), _iso(end), cursor
+        )
+        return _items(page, response)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/dashboard/history")
-def get_history(user_id: str):
+async def get_history(
+    response: Response,
+    user_id: str = Depends(current_user_id),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    page_size: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+):
+    """
+    Optional date window: start inclusive, end exclusive ('YYYY-MM-DD').
+    - page_size / cursor: returns {"items": [...], "next_cursor": ...}; pass
+      next_cursor back to fetch the following page.
+    - stream=true: returns the history as NDJSON (one transaction per line).
+    Without either, the full history is returned as a single array.
+    Responses that reach the per-request read budget are cut short: the
+    array gets an X-Next-Cursor header (continue with cursor / page_size)
+    and the stream ends with a {"next_cursor": ...} line.
+    """
+    start, end = _iso(start), _iso(end)
     try:
-        return finance_service.get_full_history(user_id)
+        if stream:
+            # Sent uncompressed (see is_history_stream)
+            return StreamingResponse(
+                finance_service.stream_history_async(user_id, start, end),
+                media_type="application/x-ndjson",
+            )
+        if page_size is not None or cursor:
+            page = await finance_service.get_history_page_async(user_id, page_size or 50, cursor, start, end)
+            return fast_json(page)
+        return _items(await finance_service.get_full_history_async(user_id, start, end), response)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
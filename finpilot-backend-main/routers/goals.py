@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from dependencies import authorize, session_user_id
 from schemas.goal import GoalInput, GoalResponse
 from services import goal_service
+from services.read_budget_service import ReadBudgetExceeded
 
 router = APIRouter(tags=["Goals"])
 
 @router.post("/savings/goal", response_model=GoalResponse)
-def create_goal(data: GoalInput):
+async def create_goal(data: GoalInput, session_user: Optional[str] = Depends(session_user_id)):
+    data.user_id = authorize(data.user_id, session_user)
     try:
-        return goal_service.create_savings_goal(data)
+        return await goal_service.create_savings_goal_async(data)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from dependencies import require_admin
+from schemas.job import JobRunInput
+from services import migration_service, precompute_service  # register the built-in jobs
+from services.scheduler_service import InvalidJobArguments, QueueFull, UnknownJob, scheduler
+
+# Operator-only: every route needs the ADMIN_TOKEN bearer credential
+router = APIRouter(tags=["Jobs"], dependencies=[Depends(require_admin)])
+
+@router.get("/jobs")
+def get_jobs_status():
+    """
+    Registered jobs (schedule, next run, counters, last run), queue depth
+    and the most recent runs.
+    """
+    return scheduler.status()
+
+@router.get("/jobs/runs/{run_id}")
+def get_job_run(run_id: str):
+    run = scheduler.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+@router.post("/jobs/{name}/run", status_code=202)
+def run_job(name: str, data: Optional[JobRunInput] = None):
+    """
+    Queues a run now; poll GET /jobs/runs/{id} for its outcome. kwargs
+    must be among the job's params (listed by GET /jobs).
+    """
+    try:
+        return scheduler.enqueue(name, **(data.kwargs if data else {}))
+    except UnknownJob as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidJobArguments as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
@@ -1,12 +1,37 @@
-from fastapi import APIRouter, HTTPException
-from schemas.salary import SalaryInput, AllocationResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from dependencies import authorize, require_admin, session_user_id
+from schemas.salary import SalaryInput, AllocationResponse, SalaryBatchInput, SalaryBatchResponse
 from services import finance_service
+from services.read_budget_service import ReadBudgetExceeded
 
 router = APIRouter(tags=["Salary"])
 
 @router.post("/salary", response_model=AllocationResponse)
-def set_salary(data: SalaryInput):
+async def set_salary(data: SalaryInput, session_user: Optional[str] = Depends(session_user_id)):
+    data.user_id = authorize(data.user_id, session_user)
     try:
-        return finance_service.set_salary_and_allocate(data)
+        return await finance_service.set_salary_and_allocate_async(data)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/salary/batch", response_model=SalaryBatchResponse, dependencies=[Depends(require_admin)])
+async def set_salaries_batch(data: SalaryBatchInput):
+    """
+    Operator-only payday run: sets many (user, month) salaries at once, each
+    with an optional allocation profile. Allocations are computed in one
+    vectorized pass and written in batched commits; the response reports
+    every input position, including items without a user_id.
+    """
+    try:
+        return await finance_service.set_salaries_batch_async(data.salaries)
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
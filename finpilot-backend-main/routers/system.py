@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Response
+from dependencies import require_admin
+from services.cache_service import cache
+from services import metrics_service, startup_service, warning_service
+
+# Operator-only, like /jobs: every route needs the ADMIN_TOKEN bearer credential
+router = APIRouter(tags=["System"], dependencies=[Depends(require_admin)])
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """
+    Hit/miss counters for the in-process dashboard cache.
+    """
+    return cache.stats()
+
+@router.get("/warnings/stats")
+def get_warning_stats():
+    """
+    Debounce counters for the background financial-health checks.
+    """
+    return warning_service.scheduler.stats()
+
+@router.get("/startup/stats")
+def get_startup_stats():
+    """
+    How long this process took to start, by import and init phase.
+    """
+    return startup_service.report()
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Request and database metrics in the Prometheus text format.
+    """
+    return Response(metrics_service.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
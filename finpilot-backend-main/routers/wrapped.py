@@ -1,17 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from dependencies import current_user_id
+from responses import fast_json
 from schemas.wrapped import WrappedSummaryResponse
 from services import wrapped_service
+from services.read_budget_service import ReadBudgetExceeded
 
 router = APIRouter(tags=["Wrapped"])
 
 
 @router.get("/wrapped/summary", response_model=WrappedSummaryResponse)
-def get_wrapped_summary(user_id: str, year: int = 2025):
+async def get_wrapped_summary(year: int = 2025, user_id: str = Depends(current_user_id)):
     """
     Get a year-end 'Budget Wrapped' summary for the user.
     Aggregates transactions, salaries, and goals for the specified year.
+    A year too large for the per-request read budget is served from its last
+    stored summary, or rejected with 400 if there is none yet.
     """
     try:
-        return wrapped_service.get_wrapped_summary(user_id, year)
+        return fast_json(await wrapped_service.get_wrapped_summary_async(user_id, year))
+    except ReadBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 
 class UserRegister(BaseModel):
     email: EmailStr
@@ -13,4 +14,7 @@ class UserResponse(BaseModel):
     user_id: str
     email: str
     name: str
-    message: str
\ No newline at end of file
+    message: str
+    # Signed session token; send it back as "Authorization: Bearer <token>"
+    token: Optional[str] = None
+    expires_at: Optional[int] = None
\ No newline at end of file
@@ -1,13 +1,43 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, conint
+from typing import Dict, List, Optional
 
 class GoalInput(BaseModel):
-    user_id: str
-    target_amount: float
+    # Optional when a session token is sent; filled from the token
+    user_id: Optional[str] = None
+    target_amount: float = Field(..., gt=0)
+    duration_months: int = Field(..., ge=1, le=600)
+    # "rd" or "sip"; chosen from the duration when omitted
+    plan: Optional[str] = None
+    # Extra what-if durations to compare (defaults to 6/12/24/36/60 months),
+    # bounded like duration_months since each one is simulated month by month
+    compare_months: Optional[List[conint(ge=1, le=600)]] = Field(None, max_length=12)
+
+class ScheduleRow(BaseModel):
+    month: int
+    contribution: float
+    interest: float
+    total_contributed: float
+    balance: float
+
+class GoalOption(BaseModel):
+    plan: str
+    suggestion: str
+    annual_return: float
     duration_months: int
+    monthly_amount: float
+    expected_return: float
+    required_monthly_amount: float
+    # p10 / p50 / p90 / mean final balance and probability_of_target
+    outcomes: Dict[str, float]
 
 class GoalResponse(BaseModel):
     goal_id: str
     suggestion: str
     monthly_amount: float
-    expected_return: float
\ No newline at end of file
+    expected_return: float
+    plan: Optional[str] = None
+    annual_return: Optional[float] = None
+    required_monthly_amount: Optional[float] = None
+    outcomes: Optional[Dict[str, float]] = None
+    schedule: List[ScheduleRow] = []
+    options: List[GoalOption] = []
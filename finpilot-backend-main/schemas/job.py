@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import Any, Dict
+
+class JobRunInput(BaseModel):
+    # Keyword arguments passed to the job function (only its registered params)
+    kwargs: Dict[str, Any] = {}
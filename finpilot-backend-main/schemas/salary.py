@@ -1,12 +1,42 @@
-from pydantic import BaseModel
-from typing import Dict
+from pydantic import BaseModel, field_validator
+from typing import Any, Dict, List, Optional
 
 class SalaryInput(BaseModel):
-    user_id: str
+    # Optional when a session token is sent; filled from the token
+    user_id: Optional[str] = None
     amount: float
     # Format: "YYYY-MM" (e.g., "2026-02")
     month: str 
+    # Allocation profile from allocation_profiles.json (e.g. "student",
+    # "family", "high_rent_city"); DEFAULT_ALLOCATION_PROFILE when omitted
+    profile: Optional[str] = None
+
+    @field_validator("month", mode="before")
+    @classmethod
+    def _normalize_month(cls, value):
+        # Zero-padded like transaction dates ("2026-2" -> "2026-02"); the
+        # month is part of the salary and allocation document IDs
+        parts = str(value).strip()[:7].split("-")
+        if len(parts) != 2 or not (parts[0].isdigit() and parts[1].isdigit()) or not 1 <= int(parts[1]) <= 12:
+            raise ValueError("month must be in YYYY-MM format")
+        return f"{int(parts[0]):04d}-{int(parts[1]):02d}"
 
 class AllocationResponse(BaseModel):
     salary: float
-    predicted_allocation: Dict[str, float]
\ No newline at end of file
+    predicted_allocation: Dict[str, float]
+
+class SalaryBatchInput(BaseModel):
+    # Raw items, validated one by one like TransactionBatchInput
+    salaries: List[Dict[str, Any]]
+
+class SalaryBatchItemResult(BaseModel):
+    index: int
+    status: str  # "saved" or "failed"
+    id: Optional[str] = None
+    predicted_allocation: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+
+class SalaryBatchResponse(BaseModel):
+    saved: int
+    failed: int
+    results: List[SalaryBatchItemResult]
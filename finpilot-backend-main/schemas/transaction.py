@@ -1,14 +1,23 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Dict, Any
+from services.query_service import normalize_date
 
 class TransactionInput(BaseModel):
-    user_id: str
+    # Optional when a session token is sent; filled from the token
+    user_id: Optional[str] = None
     amount: float
     type: str       # "credit" or "debit"
     category: str   # e.g., "food", "rent", "salary"
     date: str       # Format: "YYYY-MM-DD"
     description: Optional[str] = None
 
+    @field_validator("date", mode="before")
+    @classmethod
+    def _normalize_date(cls, value):
+        # Store dates zero-padded ("2026-2-5" -> "2026-02-05") so the lexical
+        # order Firestore uses for range queries is also chronological order
+        return normalize_date(value)
+
 class TransactionResponse(BaseModel):
     id: str
     amount: float
@@ -29,4 +38,31 @@ class DashboardSummaryResponse(BaseModel):
     total_budget: float
     total_spent: float
     remaining_salary: float
-    breakdown: List[CategorySummary]
\ No newline at end of file
+    breakdown: List[CategorySummary]
+
+class HealthWarningResponse(BaseModel):
+    # All None until the first background evaluation has run
+    status: Optional[int] = None  # 0 = safe, 1 = will run out of money
+    reason: Optional[str] = None
+    month: Optional[str] = None
+    as_of: Optional[str] = None
+    balance: Optional[float] = None
+    last_7_days_spent: Optional[float] = None
+    days_left: Optional[int] = None
+    evaluated_at: Optional[str] = None
+
+class TransactionBatchInput(BaseModel):
+    # Raw items: each one is validated as a TransactionInput on its own so a
+    # bad row is reported in the results instead of rejecting the whole batch
+    transactions: List[Dict[str, Any]]
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str  # "created" or "failed"
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class TransactionBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BatchItemResult]
@@ -1,35 +1,37 @@
 # Mocks external AI services
-import random
+from typing import Optional
+from services.allocation_service import allocate_batch
 
-def predict_budget_allocation(salary: float) -> dict:
+def predict_budget_allocation(salary: float, profile: Optional[str] = None) -> dict:
     """
-    Mock AI: Returns a standard percentage breakdown.
+    Mock AI: splits the salary by an allocation profile
+    (DEFAULT_ALLOCATION_PROFILE when none is given).
     """
-    return {
-        "food": round(salary * 0.20, 2),
-        "rent": round(salary * 0.30, 2),
-        "transport": round(salary * 0.10, 2),
-        "entertainment": round(salary * 0.10, 2),
-        "savings": round(salary * 0.20, 2),
-        "misc": round(salary * 0.10, 2)
-    }
+    return allocate_batch([salary], [profile])[0]
 
-def suggest_investment_plan(target: float, months: int) -> dict:
+def assess_financial_health(habits: dict, trend: dict, balance: float) -> dict:
     """
-    Mock AI: Suggests an investment vehicle (RD/SIP) based on duration.
+    Mock AI: the Igdtuw "Student Budget Guardrail" prediction, answered by
+    projecting the last week's daily spend over the rest of the month.
+    habits: {"previous_month_spent", "previous_month_days"}
+    trend: {"last_7_days_spent", "days_left"}
+    Returns {"status": 0 | 1, "reason": str} (1 = will run out of money).
     """
-    monthly_needed = target / months
-    
-    # Simple logic to vary the suggestion
-    if months < 12:
-        plan = "Recurring Deposit (RD)"
-        rate = 1.06 # 6%
-    else:
-        plan = "SIP (Index Fund)"
-        rate = 1.12 # 12%
+    daily_burn = trend["last_7_days_spent"] / 7
+    projected = daily_burn * trend["days_left"]
+    previous_daily = habits["previous_month_spent"] / max(habits["previous_month_days"], 1)
 
+    if balance <= 0:
+        return {"status": 1, "reason": f"The budget is already overspent by ₹{-balance:,.0f}."}
+    if projected > balance:
+        reason = (
+            f"At ₹{daily_burn:,.0f}/day you will spend ₹{projected:,.0f} in the next "
+            f"{trend['days_left']} days but only ₹{balance:,.0f} is left."
+        )
+        if previous_daily and daily_burn > previous_daily:
+            reason += f" That is {daily_burn / previous_daily:.1f}x last month's pace."
+        return {"status": 1, "reason": reason}
     return {
-        "suggestion": plan,
-        "monthly_amount": round(monthly_needed, 2),
-        "expected_return": round(target * rate, 2)
-    }
\ No newline at end of file
+        "status": 0,
+        "reason": f"₹{balance:,.0f} left covers ₹{projected:,.0f} of projected spend at ₹{daily_burn:,.0f}/day.",
+    }
@@ -0,0 +1,81 @@
+import json
+import threading
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from config import ALLOCATION_PROFILES_PATH, DEFAULT_ALLOCATION_PROFILE
+
+
+class UnknownProfile(ValueError):
+    pass
+
+
+class AllocationProfiles:
+    """
+    Allocation profiles as one (profiles x categories) share matrix, so any
+    number of (salary, profile) rows is allocated in a single NumPy pass.
+    """
+
+    def __init__(self, profiles: Dict[str, Dict[str, float]]):
+        if not profiles:
+            raise ValueError("At least one allocation profile is required")
+        for name, shares in profiles.items():
+            if any(share < 0 for share in shares.values()):
+                raise ValueError(f"Allocation profile '{name}' has a negative share")
+            if not np.isclose(sum(shares.values()), 1.0):
+                raise ValueError(f"Allocation profile '{name}' shares must sum to 1")
+
+        self.names = list(profiles)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        # Category order follows first appearance, so "standard" keeps its order
+        self.categories = list(dict.fromkeys(cat for shares in profiles.values() for cat in shares))
+        self.shares = np.array(
+            [[profiles[name].get(cat, 0.0) for cat in self.categories] for name in self.names]
+        )
+        # A category a profile does not list is left out of its allocations
+        self.present = np.array(
+            [[cat in profiles[name] for cat in self.categories] for name in self.names]
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "AllocationProfiles":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def profile_indices(self, profiles: Sequence[Optional[str]]) -> np.ndarray:
+        try:
+            return np.fromiter(
+                (self.index[p or DEFAULT_ALLOCATION_PROFILE] for p in profiles), dtype=np.intp, count=len(profiles)
+            )
+        except KeyError as e:
+            raise UnknownProfile(f"Unknown allocation profile {e.args[0]!r}") from None
+
+    def allocate(self, salaries: Sequence[float], profiles: Sequence[Optional[str]]) -> List[Dict[str, float]]:
+        """
+        Allocation per row; profiles[i] of None means DEFAULT_ALLOCATION_PROFILE.
+        Raises UnknownProfile if any row names a profile that does not exist.
+        """
+        idx = self.profile_indices(profiles)
+        amounts = np.round(np.asarray(salaries, dtype=float)[:, None] * self.shares[idx], 2)
+        present = self.present[idx]
+        categories = self.categories
+        return [
+            {cat: amt for cat, amt, keep in zip(categories, row.tolist(), mask.tolist()) if keep}
+            for row, mask in zip(amounts, present)
+        ]
+
+
+_profiles: Optional[AllocationProfiles] = None
+_lock = threading.Lock()
+
+
+def get_profiles() -> AllocationProfiles:
+    global _profiles
+    if _profiles is None:
+        with _lock:
+            if _profiles is None:
+                _profiles = AllocationProfiles.from_file(ALLOCATION_PROFILES_PATH)
+    return _profiles
+
+
+def allocate_batch(salaries: Sequence[float], profiles: Sequence[Optional[str]]) -> List[Dict[str, float]]:
+    return get_profiles().allocate(salaries, profiles)
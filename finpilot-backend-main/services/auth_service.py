@@ -1,70 +1,60 @@
-from google.cloud import firestore
-from database import db
+from storage import get_async_storage
 from schemas.auth import UserRegister, UserLogin
-import bcrypt  # <--- Using bcrypt directly now
+from services import hashing_service, session_service
 
-def get_password_hash(password: str) -> str:
-    # Convert string to bytes, hash it, then convert back to string for storage
-    pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    return hashed.decode('utf-8')
+# Hashing and verification run in hashing_service's process pool, which
+# raises hashing_service.HashingBusy when its admission limit is reached.
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # Convert both to bytes to compare
-    pwd_bytes = plain_password.encode('utf-8')
-    hash_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(pwd_bytes, hash_bytes)
+async def register_user_async(user: UserRegister):
+    storage = get_async_storage()
 
-def register_user(user: UserRegister):
-    # 1. Check if user already exists
-    users_ref = db.collection("users")
-    query = users_ref.where("email", "==", user.email).stream()
-    
-    for _ in query:
+    # 1. Check if user already exists (skips hashing for known emails;
+    #    create_user enforces uniqueness atomically)
+    if await storage.get_user_by_email(user.email):
         raise ValueError("User with this email already exists")
 
     # 2. Hash the password
-    hashed_pwd = get_password_hash(user.password)
+    hashed_pwd = await hashing_service.hash_password_async(user.password)
 
     # 3. Create User Document
-    new_user_ref = users_ref.document()
-    user_data = {
+    user_id = await storage.create_user({
         "email": user.email,
         "name": user.name,
         "password_hash": hashed_pwd,
-        "created_at": firestore.SERVER_TIMESTAMP
-    }
-    new_user_ref.set(user_data)
+    })
 
+    token, expires_at = session_service.issue_token(user_id)
     return {
-        "user_id": new_user_ref.id,
+        "user_id": user_id,
         "email": user.email,
         "name": user.name,
-        "message": "User registered successfully"
+        "message": "User registered successfully",
+        "token": token,
+        "expires_at": expires_at,
     }
 
-def login_user(creds: UserLogin):
+async def login_user_async(creds: UserLogin):
     # 1. Find user by email
-    users_ref = db.collection("users")
-    query = users_ref.where("email", "==", creds.email).limit(1).stream()
-    
-    user_doc = None
-    for doc in query:
-        user_doc = doc
-    
-    if not user_doc:
+    user_data = await get_async_storage().get_user_by_email(creds.email)
+
+    if not user_data:
         raise ValueError("Invalid email or password")
-    
-    user_data = user_doc.to_dict()
 
     # 2. Verify Password
-    if not verify_password(creds.password, user_data["password_hash"]):
+    if not await hashing_service.verify_password_async(creds.password, user_data["password_hash"]):
         raise ValueError("Invalid email or password")
 
+    token, expires_at = session_service.issue_token(user_data["id"])
     return {
-        "user_id": user_doc.id,
+        "user_id": user_data["id"],
         "email": user_data["email"],
         "name": user_data["name"],
-        "message": "Login successful"
-    }
\ No newline at end of file
+        "message": "Login successful",
+        "token": token,
+        "expires_at": expires_at,
+    }
+
+def logout_user(token: str):
+    # Raises session_service.InvalidToken (a ValueError) for bad tokens
+    session_service.revoke_token(token)
+    return {"message": "Logged out"}
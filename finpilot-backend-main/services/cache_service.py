@@ -0,0 +1,132 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+from config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache with per-entry TTLs.
+    Keys are (user_id, endpoint, params) so a user's entries can be dropped
+    together when they write. In-process only: each worker keeps its own.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._by_user: Dict[str, Set[Tuple]] = {}
+        # Bumped on every invalidation so a read that raced a write cannot
+        # store its (now stale) result after the write invalidated the user;
+        # _epoch does the same for clear(), across all users
+        self._generation: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, user_id: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generation.get(user_id, 0)
+
+    def set(self, key: Tuple, value: Any, ttl: float = None, generation: Tuple[int, int] = None) -> None:
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generation.get(key[0], 0)):
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+            self._generation[user_id] = self._generation.get(user_id, 0) + 1
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self._epoch += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Tuple) -> None:
+        self._entries.pop(key, None)
+        user_keys = self._by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._by_user[key[0]]
+
+
+cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+
+def cached(endpoint: str, ttl: float = None) -> Callable:
+    """
+    Read-through caching for service functions (sync or async) whose first
+    argument is user_id. The sync and async variants of an endpoint share
+    the same endpoint name, and therefore the same entries.
+    Cached values are shared between requests and must not be mutated.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(user_id: str, *args: Hashable, **kwargs: Hashable):
+                key = (user_id, endpoint, args, tuple(sorted(kwargs.items())))
+                value = cache.get(key)
+                if value is _MISSING:
+                    generation = cache.generation(user_id)
+                    value = await func(user_id, *args, **kwargs)
+                    cache.set(key, value, ttl, generation)
+                return value
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(user_id: str, *args: Hashable, **kwargs: Hashable):
+            key = (user_id, endpoint, args, tuple(sorted(kwargs.items())))
+            value = cache.get(key)
+            if value is _MISSING:
+                generation = cache.generation(user_id)
+                value = func(user_id, *args, **kwargs)
+                cache.set(key, value, ttl, generation)
+            return value
+        return wrapper
+    return decorator
@@ -1,74 +1,129 @@
-from google.cloud import firestore
-from database import db
+import asyncio
+import json
+from typing import List, Optional
+from pydantic import ValidationError
+from storage import get_async_storage
 from services.ai_service import predict_budget_allocation
+from services.allocation_service import get_profiles
+from services.query_service import encode_cursor, decode_cursor
+from services.cache_service import cache, cached
+from services.read_budget_service import lookahead, row_limit
+from services import precompute_service, warning_service
 from schemas.salary import SalaryInput
 from schemas.transaction import TransactionInput
+from config import DEFAULT_ALLOCATION_PROFILE, MAX_BATCH_SALARIES, MAX_BATCH_TRANSACTIONS
 
-def set_salary_and_allocate(data: SalaryInput):
-    # 1. Store Salary Record
-    salary_ref = db.collection("salaries").document()
-    salary_ref.set({
-        "user_id": data.user_id,
-        "amount": data.amount,
-        "month": data.month,
-        "created_at": firestore.SERVER_TIMESTAMP
-    })
-
-    # 2. Get AI Prediction
-    allocation_map = predict_budget_allocation(data.amount)
-
-    # 3. Store Allocation
-    # We query to see if an allocation already exists for this month to update it, 
-    # or create a new one. For simplicity, we'll just create new.
-    alloc_ref = db.collection("allocations").document()
-    alloc_ref.set({
-        "user_id": data.user_id,
-        "month": data.month,
-        "categories": allocation_map
-    })
+def _validation_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
 
-    return {
-        "salary": data.amount,
-        "predicted_allocation": allocation_map
-    }
+def _batch_owner_error(txn: dict, session_user: Optional[str]) -> Optional[str]:
+    # Per-item form of dependencies.authorize: the session decides, and
+    # without one the item must name its user
+    if session_user is None:
+        return None if txn["user_id"] else "user_id: Field required"
+    if txn["user_id"] and txn["user_id"] != session_user:
+        return "user_id does not match the session"
+    txn["user_id"] = session_user
+    return None
+
+def _validate_batch(items: List[dict], session_user: Optional[str] = None):
+    """
+    Splits raw batch items into valid transactions and per-item results,
+    with validation and ownership failures already filled in.
+    """
+    if len(items) > MAX_BATCH_TRANSACTIONS:
+        raise ValueError(f"A batch can hold at most {MAX_BATCH_TRANSACTIONS} transactions")
+
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            txn = TransactionInput(**item).dict()
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "failed", "error": _validation_error(e)}
+            continue
+        except TypeError as e:
+            # Item was not a JSON object
+            results[index] = {"index": index, "status": "failed", "error": str(e)}
+            continue
+        error = _batch_owner_error(txn, session_user)
+        if error:
+            results[index] = {"index": index, "status": "failed", "error": error}
+            continue
+        valid.append((index, txn))
+    return valid, results
+
+def _batch_response(valid: list, outcomes: list, results: list) -> dict:
+    for (index, _), outcome in zip(valid, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = {"index": index, "status": "failed", "error": str(outcome)}
+        else:
+            results[index] = {"index": index, "status": "created", "id": outcome}
 
-def add_transaction(data: TransactionInput):
-    doc_ref = db.collection("transactions").document()
-    txn_data = data.dict()
-    doc_ref.set(txn_data)
-    return {"id": doc_ref.id, "status": "success"}
+    # Every user touched by a committed row gets fresh dashboard reads and
+    # one (coalesced) health check
+    committed = [txn for (index, txn), outcome in zip(valid, outcomes) if not isinstance(outcome, Exception)]
+    for txn in committed:
+        cache.invalidate_user(txn["user_id"])
+    warning_service.notify_transactions(committed)
+    precompute_service.mark_transactions_stale(committed)
 
-def get_dashboard_summary(user_id: str, month_prefix: str):
+    created = sum(1 for r in results if r["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+def _prepare_salary_batch(items: List[dict]):
     """
-    month_prefix: "2026-02"
+    Validates raw salary items and allocates every valid one in a single
+    vectorized pass. Returns (index, row) pairs ready for storage and the
+    per-item results with failures already filled in.
     """
-    # 1. Fetch Allocation
-    allocs = db.collection("allocations")\
-        .where("user_id", "==", user_id)\
-        .where("month", "==", month_prefix)\
-        .limit(1).stream()
-    
-    budget_map = {}
-    for a in allocs:
-        budget_map = a.to_dict().get("categories", {})
+    if len(items) > MAX_BATCH_SALARIES:
+        raise ValueError(f"A batch can hold at most {MAX_BATCH_SALARIES} salaries")
+
+    profiles = get_profiles()
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            data = SalaryInput(**item)
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "failed", "error": _validation_error(e)}
+            continue
+        except TypeError as e:
+            results[index] = {"index": index, "status": "failed", "error": str(e)}
+            continue
+        # The operator route has no session to fill user_id from
+        if not (data.user_id or "").strip():
+            results[index] = {"index": index, "status": "failed", "error": "user_id: Field required"}
+            continue
+        if (data.profile or DEFAULT_ALLOCATION_PROFILE) not in profiles.index:
+            results[index] = {"index": index, "status": "failed", "error": f"Unknown allocation profile '{data.profile}'"}
+            continue
+        valid.append((index, data))
+
+    allocations = profiles.allocate([d.amount for _, d in valid], [d.profile for _, d in valid]) if valid else []
+    rows = [
+        (index, {"user_id": d.user_id, "month": d.month, "amount": d.amount, "categories": categories})
+        for (index, d), categories in zip(valid, allocations)
+    ]
+    return rows, results
+
+def _salary_batch_response(rows: list, outcomes: list, results: list) -> dict:
+    for (index, row), outcome in zip(rows, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = {"index": index, "status": "failed", "error": str(outcome)}
+        else:
+            results[index] = {"index": index, "status": "saved", "id": outcome, "predicted_allocation": row["categories"]}
+            cache.invalidate_user(row["user_id"])
+            precompute_service.mark_stale(row["user_id"], int(row["month"][:4]))
+
+    saved = sum(1 for r in results if r["status"] == "saved")
+    return {"saved": saved, "failed": len(results) - saved, "results": results}
+
+def _build_summary(month_prefix: str, budget_map: dict, rollup: dict) -> dict:
+    spent_map = rollup.get("spent", {})
+    total_spent = rollup.get("total_debit", 0)
 
-    # 2. Fetch Transactions (Client-side filtering for simple hackathon implementation)
-    # In production, use composite indexes for date range queries
-    txns = db.collection("transactions").where("user_id", "==", user_id).stream()
-    
-    spent_map = {}
-    total_spent = 0
-    
-    for doc in txns:
-        t = doc.to_dict()
-        # Check if transaction belongs to this month
-        if t.get("date", "").startswith(month_prefix) and t.get("type") == "debit":
-            cat = t.get("category", "misc")
-            amt = t.get("amount", 0)
-            spent_map[cat] = spent_map.get(cat, 0) + amt
-            total_spent += amt
-
-    # 3. Build Response
     breakdown = []
     total_budget = sum(budget_map.values())
     
@@ -102,19 +157,141 @@ def get_dashboard_summary(user_id: str, month_prefix: str):
         "breakdown": breakdown
     }
 
-def get_category_transactions(user_id: str, category: str):
-    txns = db.collection("transactions")\
-        .where("user_id", "==", user_id)\
-        .where("category", "==", category)\
-        .stream()
-    
-    return [
-        {**doc.to_dict(), "id": doc.id} 
-        for doc in txns
-    ]
+def _build_page(rows: list, page_size: int) -> dict:
+    items = rows[:page_size]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > page_size else None
+    return {"items": items, "next_cursor": next_cursor}
+
+def _budgeted(rows: list, limit: Optional[int]) -> dict:
+    # rows were fetched with lookahead(limit); None means no read budget
+    return _build_page(rows, limit) if limit is not None else {"items": rows, "next_cursor": None}
+
+# ── Request path ──
+# The routes are async and await the async storage backend, running
+# independent reads concurrently. Background work (warnings, Wrapped
+# precompute, migrations) reads through the sync backend in its own services.
+
+async def set_salary_and_allocate_async(data: SalaryInput):
+    # 1. Get AI Prediction
+    allocation_map = predict_budget_allocation(data.amount, data.profile)
 
-def get_full_history(user_id: str):
-    txns = db.collection("transactions").where("user_id", "==", user_id).stream()
-    # Sort in python for simplicity
-    data = [{**doc.to_dict(), "id": doc.id} for doc in txns]
-    return sorted(data, key=lambda x: x['date'], reverse=True)
\ No newline at end of file
+    # 2. Store Salary and Allocation
+    # Both are keyed by (user_id, month) and written together, so
+    # resubmitting a month replaces its records instead of adding more
+    await get_async_storage().set_salary(data.user_id, data.month, data.amount, allocation_map)
+    cache.invalidate_user(data.user_id)
+    precompute_service.mark_stale(data.user_id, int(data.month[:4]))
+
+    return {
+        "salary": data.amount,
+        "predicted_allocation": allocation_map
+    }
+
+async def add_transaction_async(data: TransactionInput):
+    # The backend folds the transaction into its monthly rollup atomically
+    txn_id = await get_async_storage().add_transaction(data.dict())
+    cache.invalidate_user(data.user_id)
+    # Health check and Wrapped refresh run in the background
+    warning_service.notify_transactions([data.dict()])
+    precompute_service.mark_transactions_stale([data.dict()])
+    return {"id": txn_id, "status": "success"}
+
+async def set_salaries_batch_async(items: List[dict]):
+    rows, results = _prepare_salary_batch(items)
+    outcomes = await get_async_storage().set_salaries([row for _, row in rows]) if rows else []
+    return _salary_batch_response(rows, outcomes, results)
+
+async def add_transactions_batch_async(items: List[dict], session_user: Optional[str] = None):
+    valid, results = _validate_batch(items, session_user)
+    outcomes = await get_async_storage().add_transactions([txn for _, txn in valid]) if valid else []
+    return _batch_response(valid, outcomes, results)
+
+@cached("dashboard_summary")
+async def get_dashboard_summary_async(user_id: str, month_prefix: str):
+    """
+    month_prefix: "2026-02". The month's allocation and rollup (one document
+    instead of the full history) are read concurrently.
+    """
+    storage = get_async_storage()
+    allocation, rollup = await asyncio.gather(
+        storage.get_allocation(user_id, month_prefix),
+        storage.get_monthly_rollup(user_id, month_prefix),
+    )
+    budget_map = allocation.get("categories", {}) if allocation else {}
+    return _build_summary(month_prefix, budget_map, rollup)
+
+@cached("category_transactions")
+async def get_category_transactions_async(
+    user_id: str,
+    category: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    The category's transactions, oldest first, as {"items", "next_cursor"}.
+    next_cursor is only set when the read budget cut the list short.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    limit = row_limit()
+    txns = get_async_storage().list_transactions(
+        user_id, start=start, end=end, category=category, limit=lookahead(limit), after=after
+    )
+    return _budgeted([t async for t in txns], limit)
+
+@cached("history")
+async def get_full_history_async(user_id: str, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Newest-first history as {"items", "next_cursor"}; a next_cursor (set when
+    the read budget cut it short) continues through get_history_page_async.
+    """
+    # Ordered newest-first by the backend (user_id + date DESC index)
+    limit = row_limit()
+    txns = get_async_storage().list_transactions(
+        user_id, start=start, end=end, descending=True, limit=lookahead(limit)
+    )
+    return _budgeted([t async for t in txns], limit)
+
+@cached("history_page")
+async def get_history_page_async(
+    user_id: str,
+    page_size: int,
+    cursor: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    """
+    One newest-first page of history plus the cursor for the next page
+    (None once the history is exhausted).
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # Pages never exceed what the read budget has left
+    limit = row_limit()
+    if limit is not None:
+        page_size = min(page_size, limit)
+    # Fetch one extra row to learn whether another page exists
+    txns = get_async_storage().list_transactions(
+        user_id, start=start, end=end, descending=True, limit=page_size + 1, after=after
+    )
+    return _build_page([t async for t in txns], page_size)
+
+async def stream_history_async(user_id: str, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Yields the history as NDJSON lines while the backend is still streaming,
+    so the first rows are sent before the whole history has been read. When
+    the read budget cuts it short, a final {"next_cursor": ...} line says
+    where to continue.
+    """
+    limit = row_limit()
+    last = None
+    count = 0
+    txns = get_async_storage().list_transactions(
+        user_id, start=start, end=end, descending=True, limit=lookahead(limit)
+    )
+    async for txn in txns:
+        if count == limit:
+            yield json.dumps({"next_cursor": encode_cursor(last)}) + "\n"
+            return
+        count += 1
+        last = txn
+        yield json.dumps(txn, default=str) + "\n"
@@ -1,18 +1,39 @@
-from database import db
-from services.ai_service import suggest_investment_plan
+import asyncio
+from storage import get_async_storage
+from services.cache_service import cache
+from services.projection_service import DEFAULT_OPTION_MONTHS, project_goal_options
 from schemas.goal import GoalInput
 
-def create_savings_goal(data: GoalInput):
-    # 1. Get AI Suggestion
-    suggestion = suggest_investment_plan(data.target_amount, data.duration_months)
-    
-    # 2. Store Goal
-    doc_ref = db.collection("savings_goals").document()
-    goal_record = data.dict()
-    goal_record.update(suggestion)
-    doc_ref.set(goal_record)
+def _plan_goal(data: GoalInput):
+    """
+    Projects the requested duration and every what-if duration in one call.
+    Returns the goal record to store and the response body (without goal_id).
+    """
+    compare = data.compare_months if data.compare_months is not None else DEFAULT_OPTION_MONTHS
+    durations = [data.duration_months] + [m for m in compare if m != data.duration_months]
+    projection, *options = project_goal_options(data.target_amount, durations, data.plan)
+
+    # Only the chosen plan is stored; the schedule and options are derived data
+    goal_record = data.dict(exclude={"compare_months"})
+    goal_record.update({
+        "plan": projection["plan"],
+        "suggestion": projection["suggestion"],
+        "monthly_amount": projection["monthly_amount"],
+        "expected_return": projection["expected_return"],
+    })
+    response = {
+        **projection,
+        "options": [{k: v for k, v in option.items() if k != "schedule"} for option in options],
+    }
+    return goal_record, response
+
+async def create_savings_goal_async(data: GoalInput):
+    # The Monte Carlo projection is CPU-bound; keep it off the event loop
+    goal_record, response = await asyncio.to_thread(_plan_goal, data)
+    goal_id = await get_async_storage().add_goal(goal_record)
+    cache.invalidate_user(data.user_id)
     
     return {
-        "goal_id": doc_ref.id,
-        **suggestion
-    }
\ No newline at end of file
+        "goal_id": goal_id,
+        **response
+    }
@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from config import BCRYPT_ROUNDS, HASH_MAX_PENDING, HASH_WORKERS
+
+# bcrypt is deliberately slow and holds the CPU for its whole run. Hashing
+# and verification happen in a dedicated process pool so a login storm
+# competes for its own workers, not the threadpool every endpoint shares.
+# Workers are never forked from the app itself: by the time they start, the
+# app runs scheduler, anyio and gRPC threads, and forking a multi-threaded
+# process can deadlock the child on a lock some other thread held. They come
+# from a forkserver (a clean single-threaded process) where available, and
+# are spawned otherwise. Either way a worker re-imports the entry script
+# (which therefore needs the usual `if __name__ == "__main__":` guard) and
+# this module, which is cheap now that Firebase is initialised by the app's
+# lifespan rather than on import.
+
+
+class HashingBusy(Exception):
+    """Raised instead of queueing when HASH_MAX_PENDING jobs are already waiting."""
+
+
+# ── Worker functions (run in the pool processes) ──
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password: str, hashed: str) -> bool:
+    # The cost factor is read from the hash, so older hashes keep verifying
+    # after BCRYPT_ROUNDS changes
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+# ── Pool and admission control ──
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=context)
+    return _pool
+
+
+def start() -> None:
+    """
+    Starts the pool and its first worker (called by the app's lifespan), so
+    the first login does not wait for a worker process to boot.
+    """
+    _get_pool().submit(int).result()
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    # A worker that died takes the whole executor down; start a fresh one
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args) -> Future:
+    global _pending
+    with _pool_lock:
+        if _pending >= HASH_MAX_PENDING:
+            raise HashingBusy("Too many authentication requests, please retry shortly")
+        _pending += 1
+
+    pool = _get_pool()
+
+    def done(future: Future) -> None:
+        global _pending
+        with _pool_lock:
+            _pending -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            _reset_pool(pool)
+
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        with _pool_lock:
+            _pending -= 1
+        _reset_pool(pool)
+        raise
+    future.add_done_callback(done)
+    return future
+
+
+def hash_password(password: str) -> str:
+    return _submit(_hash, password, BCRYPT_ROUNDS).result()
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return _submit(_verify, password, hashed).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, password, BCRYPT_ROUNDS))
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await asyncio.wrap_future(_submit(_verify, password, hashed))
+
+
+def stats() -> dict:
+    with _pool_lock:
+        return {"workers": HASH_WORKERS, "pending": _pending, "max_pending": HASH_MAX_PENDING}
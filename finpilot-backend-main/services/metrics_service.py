@@ -0,0 +1,210 @@
+import contextvars
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Prometheus text-format metrics, kept in-process like the cache: with
+# several workers each exposes its own and the scraper sums them. Routes are
+# labelled by their template ("/dashboard/category/{category_name}"), never
+# the raw path, so label cardinality stays bounded.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DOCUMENT_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+# Route label for database work done outside any request (background jobs)
+BACKGROUND = "background"
+# Route label for requests that matched no route, instead of their raw path
+UNMATCHED = "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, le: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple, float] = {} if labels else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in items]
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, _number(bound))} {cumulative}")
+            cumulative += series[-2]
+            lines.append(f"{self.name}_bucket{_labels(self.labels, key, '+Inf')} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+# ── HTTP ──
+requests_total = Counter("http_requests_total", "Requests handled", ("method", "route", "status"))
+request_errors = Counter(
+    "http_request_errors_total", "Requests that ended in a 5xx or an unhandled exception", ("method", "route"),
+)
+request_latency = Histogram("http_request_duration_seconds", "Request latency in seconds", ("method", "route"))
+in_flight = Gauge("http_requests_in_flight", "Requests currently being handled")
+
+# ── Database ──
+db_queries = Counter("db_queries_total", "Queries and document lookups issued", ("backend", "route"))
+db_reads = Counter("db_documents_read_total", "Documents (rows) read", ("backend", "route"))
+db_writes = Counter("db_documents_written_total", "Documents (rows) written", ("backend", "route"))
+db_reads_per_request = Histogram(
+    "db_documents_read_per_request", "Documents read by a single request", ("route",), DOCUMENT_BUCKETS,
+)
+read_budget_exceeded = Counter(
+    "db_read_budget_exceeded_total", "Requests that crossed a read budget limit", ("route", "limit"),
+)
+
+REGISTRY = [
+    requests_total, request_errors, request_latency, in_flight,
+    db_queries, db_reads, db_writes, db_reads_per_request, read_budget_exceeded,
+]
+
+
+class RequestStats:
+    """Database work done on behalf of one request, per backend."""
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.user_id: Optional[str] = None
+        # A read_budget_service.ReadBudget, charged on every read when set
+        self.budget = None
+        # backend -> [queries, reads, writes]
+        self.backends: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return BACKGROUND
+        # The router stores the matched route in the (shared) ASGI scope
+        return getattr(self.scope.get("route"), "path", UNMATCHED)
+
+    def add(self, backend: str, queries: int, reads: int, writes: int) -> None:
+        with self._lock:
+            totals = self.backends.setdefault(backend, [0, 0, 0])
+            totals[0] += queries
+            totals[1] += reads
+            totals[2] += writes
+
+    @property
+    def reads(self) -> int:
+        return sum(totals[1] for totals in self.backends.values())
+
+
+# Set by MetricsMiddleware for the duration of a request; sync routes run in
+# a worker thread that inherits it. Threads the app starts itself do not, so
+# their database work is counted under BACKGROUND.
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def _count(backend: str, route: str, queries: int, reads: int, writes: int) -> None:
+    if queries:
+        db_queries.inc(backend, route, amount=queries)
+    if reads:
+        db_reads.inc(backend, route, amount=reads)
+    if writes:
+        db_writes.inc(backend, route, amount=writes)
+
+
+def record_db(backend: str, queries: int = 0, reads: int = 0, writes: int = 0) -> None:
+    """
+    Called by the data-access layer. Inside a request the counts wait for
+    finish_request(), since the route is only known once routing is done.
+    """
+    stats = current_request.get()
+    if stats is None:
+        _count(backend, BACKGROUND, queries, reads, writes)
+        return
+    stats.add(backend, queries, reads, writes)
+    if reads and stats.budget is not None:
+        stats.budget.charge(stats)
+
+
+def tag_user(user_id: str) -> None:
+    """Notes which user the current request acts for (for budget logs)."""
+    stats = current_request.get()
+    if stats is not None:
+        stats.user_id = user_id
+
+
+def finish_request(stats: RequestStats) -> None:
+    route = stats.route
+    for backend, (queries, reads, writes) in stats.backends.items():
+        _count(backend, route, queries, reads, writes)
+    db_reads_per_request.observe(route, value=stats.reads)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,36 @@
+from storage import get_storage
+from services.cache_service import cache
+from services.scheduler_service import scheduler
+
+# One-off data migrations, run on demand through the job queue
+# (POST /jobs/{name}/run). Each is idempotent: a second run finds nothing
+# left to fix.
+
+
+def normalize_transaction_dates() -> dict:
+    """
+    Zero-pads transaction dates stored before input validation, so the
+    date-range queries behind the dashboard and history find them.
+    """
+    fixed = get_storage().normalize_transaction_dates()
+    if fixed:
+        cache.clear()
+    return {"fixed": fixed}
+
+
+def backfill_email_index() -> dict:
+    """
+    Indexes users registered before the user_emails index existed. Once it
+    has run, EMAIL_INDEX_FALLBACK=false retires the query on users.email.
+    """
+    return {"added": get_storage().backfill_email_index()}
+
+
+scheduler.register(
+    "normalize_transaction_dates", normalize_transaction_dates,
+    description="One-off: zero-pad legacy transaction dates and rebuild their rollups",
+)
+scheduler.register(
+    "backfill_email_index", backfill_email_index,
+    description="One-off: add user_emails entries for users registered before the index",
+)
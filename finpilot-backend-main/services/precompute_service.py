@@ -0,0 +1,64 @@
+import threading
+from datetime import date
+from typing import List, Optional, Set, Tuple
+from services import warning_service, wrapped_service
+from services.scheduler_service import scheduler
+from config import WRAPPED_PRECOMPUTE_CRON, WARNING_WORKERS
+
+# Jobs that move heavy aggregation off the request path. Writes only record
+# what went stale; the scheduled run recomputes it, so the next request finds
+# a stored result whose version is current.
+
+_stale: Set[Tuple[str, int]] = set()
+_lock = threading.Lock()
+
+
+def mark_stale(user_id: str, year: int) -> None:
+    with _lock:
+        _stale.add((user_id, year))
+
+
+def mark_transactions_stale(txns: List[dict]) -> None:
+    with _lock:
+        _stale.update((txn["user_id"], int(txn["date"][:4])) for txn in txns)
+
+
+def precompute_wrapped(user_id: Optional[str] = None, year: Optional[int] = None) -> dict:
+    """
+    Refreshes stored Wrapped summaries: the given user's (year defaults to
+    the current one), or every (user, year) written since the last run.
+    """
+    if user_id is not None:
+        targets = {(user_id, int(year or date.today().year))}
+    else:
+        with _lock:
+            targets = set(_stale)
+            _stale.clear()
+
+    failed = []
+    for target in sorted(targets):
+        try:
+            wrapped_service.get_wrapped_summary(*target)
+        except Exception:
+            failed.append(target)
+    if failed:
+        # Put them back so the retry (or the next tick) picks them up
+        with _lock:
+            _stale.update(failed)
+        raise RuntimeError(f"{len(failed)} of {len(targets)} Wrapped summaries failed")
+    return {"refreshed": len(targets)}
+
+
+def refresh_health_warning(user_id: str, as_of: Optional[str] = None) -> dict:
+    """On-demand financial-health check, outside the write-triggered debounce."""
+    return warning_service.evaluate(user_id, as_of or date.today().isoformat())
+
+
+scheduler.register(
+    "wrapped_summaries", precompute_wrapped, WRAPPED_PRECOMPUTE_CRON, params=("user_id", "year"),
+    description="Recompute Budget Wrapped for users with new data since the last run",
+)
+scheduler.register(
+    "health_warning", refresh_health_warning, concurrency=WARNING_WORKERS, params=("user_id", "as_of"),
+    description="Re-run a user's financial-health check",
+)
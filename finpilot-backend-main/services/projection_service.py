@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import MONTE_CARLO_SIMULATIONS, PROJECTION_CACHE_SIZE
+
+# Investment plans: annual expected return and volatility of that return.
+# Contributions are made at the start of each month and compound monthly.
+PLANS = {
+    "rd": {"suggestion": "Recurring Deposit (RD)", "annual_return": 0.06, "annual_volatility": 0.0},
+    "sip": {"suggestion": "SIP (Index Fund)", "annual_return": 0.12, "annual_volatility": 0.15},
+}
+
+# What-if durations /savings/goal compares when the request names none
+DEFAULT_OPTION_MONTHS = (6, 12, 24, 36, 60)
+
+PERCENTILES = (10, 50, 90)
+
+
+class UnknownPlan(ValueError):
+    pass
+
+
+def default_plan(months: int) -> str:
+    # Short horizons stay in a deposit, longer ones go to equity
+    return "rd" if months < 12 else "sip"
+
+
+def _monthly_rate(plan: dict) -> float:
+    return (1 + plan["annual_return"]) ** (1 / 12) - 1
+
+
+def _annuity_factor(rate: float, months: int) -> float:
+    # Balance after `months` start-of-month contributions of 1
+    if rate == 0:
+        return float(months)
+    return ((1 + rate) ** months - 1) / rate * (1 + rate)
+
+
+def _schedule(monthly_amount: float, rate: float, months: int) -> List[dict]:
+    rows, balance, contributed = [], 0.0, 0.0
+    for month in range(1, months + 1):
+        contributed += monthly_amount
+        interest = (balance + monthly_amount) * rate
+        balance += monthly_amount + interest
+        rows.append({
+            "month": month,
+            "contribution": round(monthly_amount, 2),
+            "interest": round(interest, 2),
+            "total_contributed": round(contributed, 2),
+            "balance": round(balance, 2),
+        })
+    return rows
+
+
+def _simulate(plan: dict, durations: Sequence[int]) -> Dict[int, np.ndarray]:
+    """
+    Per unit monthly contribution, the simulated final balance after each
+    of `durations` months (one array of MONTE_CARLO_SIMULATIONS outcomes each).
+    All durations share one set of paths, so comparing options costs a
+    single simulation of the longest one.
+    """
+    horizon = max(durations)
+    sigma = plan["annual_volatility"] / np.sqrt(12)
+    mu = np.log1p(plan["annual_return"]) / 12 - sigma ** 2 / 2
+    # Drawn as (months, simulations) so the first n months of the paths are
+    # the same whatever the horizon, keeping memoized results consistent
+    rng = np.random.default_rng(0)
+    growth = np.exp(mu + sigma * rng.standard_normal((horizon, MONTE_CARLO_SIMULATIONS)))
+
+    # Balance after t months of unit contributions, B_t = (B_{t-1} + 1) * g_t,
+    # unrolled as C_t * sum_{k<=t} 1 / C_{k-1} with C the cumulative growth
+    cumulative = np.cumprod(growth, axis=0)
+    previous = np.vstack([np.ones((1, MONTE_CARLO_SIMULATIONS)), cumulative[:-1]])
+    balances = cumulative * np.cumsum(1 / previous, axis=0)
+    return {months: balances[months - 1] for months in durations}
+
+
+def _project(target: float, months: int, plan_key: str, unit_outcomes: np.ndarray) -> dict:
+    plan = PLANS[plan_key]
+    rate = _monthly_rate(plan)
+    # Saving the target itself, spread evenly, and what that grows into
+    monthly_amount = target / months
+    schedule = _schedule(monthly_amount, rate, months)
+    outcomes = unit_outcomes * monthly_amount
+    percentiles = np.percentile(outcomes, PERCENTILES)
+    return {
+        "plan": plan_key,
+        "suggestion": plan["suggestion"],
+        "annual_return": plan["annual_return"],
+        "duration_months": months,
+        "monthly_amount": round(monthly_amount, 2),
+        "expected_return": schedule[-1]["balance"],
+        # Contribution that reaches exactly the target at the expected return
+        "required_monthly_amount": round(target / _annuity_factor(rate, months), 2),
+        "outcomes": {
+            **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)},
+            "mean": round(float(outcomes.mean()), 2),
+            "probability_of_target": round(float((outcomes >= target).mean()), 4),
+        },
+        "schedule": schedule,
+    }
+
+
+class _Memo:
+    """Bounded LRU of projections keyed by (target, months, plan)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[float, int, str], dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_memo = _Memo(PROJECTION_CACHE_SIZE)
+
+
+def project_goal_options(target: float, durations: Sequence[int], plan: Optional[str] = None) -> List[dict]:
+    """
+    Projection per duration, in input order. With plan=None every duration
+    gets default_plan(months). Results are memoized and shared between
+    callers, so they must not be mutated.
+    """
+    if plan is not None and plan not in PLANS:
+        raise UnknownPlan(f"Unknown plan '{plan}' (expected one of: {', '.join(PLANS)})")
+    if any(months < 1 for months in durations):
+        raise ValueError("Durations must be at least 1 month")
+
+    keys = [(float(target), int(months), plan or default_plan(months)) for months in durations]
+    results = {key: _memo.get(key) for key in keys}
+
+    # Misses are simulated together, one pass per plan
+    missing: Dict[str, List[int]] = {}
+    for key, value in results.items():
+        if value is None:
+            missing.setdefault(key[2], []).append(key[1])
+    for plan_key, months_list in missing.items():
+        unit_outcomes = _simulate(PLANS[plan_key], months_list)
+        for months in months_list:
+            key = (float(target), months, plan_key)
+            results[key] = _project(target, months, plan_key, unit_outcomes[months])
+            _memo.set(key, results[key])
+
+    return [results[key] for key in keys]
+
+
+def project_goal(target: float, months: int, plan: Optional[str] = None) -> dict:
+    return project_goal_options(target, [months], plan)[0]
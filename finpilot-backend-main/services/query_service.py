@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import date
+from typing import Tuple
+
+# Transaction dates are stored as zero-padded "YYYY-MM-DD" strings and every
+# window is half-open (start inclusive, end exclusive), so storage backends
+# can push these ranges down as plain string comparisons.
+
+def normalize_date(value) -> str:
+    """
+    "2026-2-5" (or a date) -> "2026-02-05". Raises ValueError for anything
+    that is not a calendar date.
+    """
+    if isinstance(value, date):
+        return value.isoformat()[:10]
+    parts = str(value).strip()[:10].split("-")
+    if len(parts) != 3:
+        raise ValueError("date must be in YYYY-MM-DD format")
+    return date(int(parts[0]), int(parts[1]), int(parts[2])).isoformat()
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    if mon == 12:
+        return f"{year + 1:04d}-01"
+    return f"{year:04d}-{mon + 1:02d}"
+
+def month_bounds(month: str) -> Tuple[str, str]:
+    """
+    month: "2026-02" -> half-open range ("2026-02-01", "2026-03-01")
+    """
+    return f"{month}-01", f"{_next_month(month)}-01"
+
+def year_bounds(year: int) -> Tuple[str, str]:
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+def encode_cursor(txn: dict) -> str:
+    """
+    Opaque page cursor pointing just after the given transaction.
+    """
+    raw = json.dumps([txn["date"], txn["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Returns the (date, id) pair a cursor made by encode_cursor points after.
+    """
+    try:
+        txn_date, txn_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return txn_date, txn_id
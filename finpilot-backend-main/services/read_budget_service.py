@@ -0,0 +1,68 @@
+import json
+import logging
+from typing import Optional
+from services import metrics_service as metrics
+from config import READ_BUDGET_HARD, READ_BUDGET_SOFT
+
+# Caps the documents one request may read, so a single old account cannot
+# cost thousands of Firestore reads per page view. The data-access layer
+# charges every read to the request's budget (metrics_service.record_db);
+# services with a cursor-able result ask row_limit() up front and stop there
+# with a continuation cursor, while any other read past the hard limit
+# raises ReadBudgetExceeded, which every route answers with 400.
+
+logger = logging.getLogger("finpilot.read_budget")
+
+
+class ReadBudgetExceeded(ValueError):
+    pass
+
+
+class ReadBudget:
+    def __init__(self, soft: int = READ_BUDGET_SOFT, hard: int = READ_BUDGET_HARD):
+        self.soft = soft
+        self.hard = hard
+        self.warned = False
+
+    def charge(self, stats: "metrics.RequestStats") -> None:
+        """Called after each read; `stats` already includes it."""
+        reads = stats.reads
+        if self.soft and reads > self.soft and not self.warned:
+            self.warned = True
+            metrics.read_budget_exceeded.inc(stats.route, "soft")
+            _log("read_budget_soft_limit", stats, reads, self.soft)
+        if self.hard and reads > self.hard:
+            metrics.read_budget_exceeded.inc(stats.route, "hard")
+            _log("read_budget_hard_limit", stats, reads, self.hard)
+            raise ReadBudgetExceeded(f"Request needs more than {self.hard} document reads")
+
+
+def _log(event: str, stats: "metrics.RequestStats", reads: int, limit: int) -> None:
+    logger.warning(json.dumps({
+        "event": event,
+        "route": stats.route,
+        "method": stats.scope.get("method") if stats.scope else None,
+        "user_id": stats.user_id,
+        "reads": reads,
+        "limit": limit,
+    }))
+
+
+def row_limit() -> Optional[int]:
+    """
+    Rows the current request may still read, keeping one back for the
+    lookahead row that tells whether a continuation cursor is needed.
+    None when there is no hard limit (or no request, e.g. background jobs).
+    """
+    stats = metrics.current_request.get()
+    if stats is None or stats.budget is None or not stats.budget.hard:
+        return None
+    remaining = stats.budget.hard - stats.reads - 1
+    if remaining < 1:
+        raise ReadBudgetExceeded(f"Request has used its {stats.budget.hard} document reads")
+    return remaining
+
+
+def lookahead(limit: Optional[int]) -> Optional[int]:
+    """Rows to fetch for a row_limit() of `limit`: one extra, if limited."""
+    return None if limit is None else limit + 1
@@ -0,0 +1,346 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from config import SCHEDULER_HISTORY, SCHEDULER_MAX_QUEUE, SCHEDULER_WORKERS
+
+# In-process jobs: cron schedules and an on-demand queue share one bounded
+# worker pool. Runs beyond the pool wait in the queue (at most
+# SCHEDULER_MAX_QUEUE, then QueueFull); each job may also cap how many of its
+# own runs execute at once. Like the cache, this is per process: with several
+# workers, every process runs its own schedule.
+
+
+class UnknownJob(ValueError):
+    pass
+
+
+class InvalidJobArguments(ValueError):
+    """Raised when a run is queued with keyword arguments its job does not accept."""
+
+
+class QueueFull(Exception):
+    """Raised instead of queueing once SCHEDULER_MAX_QUEUE runs are waiting."""
+
+
+# ── Cron expressions ──
+def _parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        expr, slash, step_text = part.partition("/")
+        step = int(step_text) if slash else 1
+        if expr == "*":
+            start, end = low, high
+        elif "-" in expr:
+            start, end = (int(v) for v in expr.split("-", 1))
+        else:
+            start = int(expr)
+            end = high if slash else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Cron field '{part}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class Cron:
+    """
+    Five-field cron expression ("minute hour day month weekday", local time)
+    with *, lists, ranges and steps. Weekday 0 or 7 is Sunday. As in cron,
+    a restricted day and weekday match when either one does.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' needs 5 fields")
+        self.expression = expression
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = frozenset(d % 7 for d in _parse_field(fields[4], 0, 7))
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, t: datetime) -> bool:
+        day_ok = t.day in self.days
+        weekday_ok = (t.weekday() + 1) % 7 in self.weekdays  # Python: Monday = 0
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skips whole months/days/hours that cannot match, so this stays short
+        for _ in range(100_000):
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+# ── Jobs and runs ──
+class Job:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        schedule: Optional[str] = None,
+        max_retries: int = 2,
+        retry_delay: float = 5.0,
+        concurrency: int = 1,
+        description: str = "",
+        params: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.fn = fn
+        self.cron = Cron(schedule) if schedule else None
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.concurrency = concurrency
+        self.description = description
+        # The only keyword arguments a queued run may pass
+        self.params = tuple(params)
+        self.next_run: Optional[datetime] = None
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.retries = 0
+        self.last_run: Optional[dict] = None
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+class Run:
+    def __init__(self, job: Job, args: tuple, kwargs: dict, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.job = job
+        self.args = args
+        self.kwargs = kwargs
+        self.trigger = trigger
+        self.attempt = 1
+        self.status = "queued"  # queued -> running -> succeeded | failed (retrying in between)
+        self.ready_at = time.time()
+        self.enqueued_at = self.ready_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "job": self.job.name,
+            "trigger": self.trigger,
+            "status": self.status,
+            "attempt": self.attempt,
+            "enqueued_at": _iso(self.enqueued_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "error": self.error,
+        }
+
+
+class Scheduler:
+    def __init__(self, workers: int, max_queue: int, history: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.history = history
+        self.jobs: Dict[str, Job] = {}
+        self._queue: List[Run] = []  # ordered by (ready_at, enqueue order)
+        self._runs: "OrderedDict[str, Run]" = OrderedDict()
+        self._active = 0
+        self._cond = threading.Condition()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cron_enabled = False
+        self._stopping = False
+
+    def register(self, name: str, fn: Callable, schedule: Optional[str] = None, **options) -> Job:
+        job = Job(name, fn, schedule, **options)
+        with self._cond:
+            self.jobs[name] = job
+            if job.cron and self._cron_enabled:
+                job.next_run = job.cron.next_after(datetime.now())
+            self._cond.notify()
+        return job
+
+    # ── Lifecycle ──
+    def start(self) -> None:
+        """Starts firing cron schedules (queued runs execute without it)."""
+        with self._cond:
+            self._cron_enabled = True
+            now = datetime.now()
+            for job in self.jobs.values():
+                if job.cron and job.next_run is None:
+                    job.next_run = job.cron.next_after(now)
+            self._ensure_started()
+            self._cond.notify()
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            pool = self._pool
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _ensure_started(self) -> None:
+        # Caller holds the condition
+        if self._thread is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            self._thread = threading.Thread(target=self._dispatch, name="job-scheduler", daemon=True)
+            self._thread.start()
+
+    # ── Queue ──
+    def enqueue(self, name: str, *args, trigger: str = "manual", **kwargs) -> dict:
+        with self._cond:
+            job = self.jobs.get(name)
+            if job is None:
+                raise UnknownJob(f"Unknown job '{name}' (expected one of: {', '.join(self.jobs)})")
+            unexpected = sorted(set(kwargs) - set(job.params))
+            if unexpected:
+                accepted = ", ".join(job.params) or "none"
+                raise InvalidJobArguments(
+                    f"Job '{name}' does not accept {', '.join(unexpected)} (accepted: {accepted})"
+                )
+            return self._push(Run(job, args, kwargs, trigger)).to_dict()
+
+    def _push(self, run: Run) -> Run:
+        # Caller holds the condition
+        if len(self._queue) >= self.max_queue:
+            raise QueueFull(f"Job queue is full ({self.max_queue} runs waiting)")
+        self._queue.append(run)
+        self._queue.sort(key=lambda r: r.ready_at)
+        self._runs[run.id] = run
+        while len(self._runs) > self.history:
+            oldest = next(iter(self._runs.values()))
+            if oldest.status in ("queued", "running", "retrying"):
+                break
+            self._runs.popitem(last=False)
+        self._ensure_started()
+        self._cond.notify()
+        return run
+
+    def _fire_due_schedules(self, now: datetime) -> None:
+        for job in self.jobs.values():
+            if job.next_run is None or job.next_run > now:
+                continue
+            job.next_run = job.cron.next_after(now)
+            # A tick that finds the previous one still waiting is skipped
+            if any(r.job is job for r in self._queue):
+                continue
+            try:
+                self._push(Run(job, (), {}, "schedule"))
+            except QueueFull:
+                print(f"Job queue full, skipped scheduled run of '{job.name}'")
+
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        times = [r.ready_at for r in self._queue if r.ready_at > now]
+        times += [j.next_run.timestamp() for j in self.jobs.values() if j.next_run is not None]
+        return min(times) - now if times else None
+
+    def _take_runnable(self, now: float) -> Optional[Run]:
+        if self._active >= self.workers:
+            return None
+        for index, run in enumerate(self._queue):
+            if run.ready_at > now:
+                break
+            if run.job.running < run.job.concurrency:
+                return self._queue.pop(index)
+        return None
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while not self._stopping:
+                if self._cron_enabled:
+                    self._fire_due_schedules(datetime.now())
+                now = time.time()
+                run = self._take_runnable(now)
+                if run is None:
+                    timeout = self._next_wakeup(now)
+                    self._cond.wait(None if timeout is None else max(timeout, 0.01))
+                    continue
+                run.job.running += 1
+                self._active += 1
+                run.status = "running"
+                run.started_at = now
+                self._pool.submit(self._execute, run)
+
+    def _execute(self, run: Run) -> None:
+        job = run.job
+        try:
+            job.fn(*run.args, **run.kwargs)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        with self._cond:
+            job.running -= 1
+            self._active -= 1
+            job.runs += 1
+            run.finished_at = time.time()
+            if error is None:
+                run.status = "succeeded"
+            elif run.attempt <= job.max_retries:
+                # Retried with exponential backoff, under the same run ID
+                job.retries += 1
+                run.status, run.error = "retrying", error
+                run.ready_at = time.time() + job.retry_delay * 2 ** (run.attempt - 1)
+                run.attempt += 1
+                self._queue.append(run)
+                self._queue.sort(key=lambda r: r.ready_at)
+            else:
+                job.failures += 1
+                run.status, run.error = "failed", error
+            job.last_run = run.to_dict()
+            self._cond.notify()
+
+    # ── Status ──
+    def get_run(self, run_id: str) -> Optional[dict]:
+        with self._cond:
+            run = self._runs.get(run_id)
+            return run.to_dict() if run else None
+
+    def status(self, recent: int = 20) -> dict:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "active": self._active,
+                "queued": len(self._queue),
+                "max_queue": self.max_queue,
+                "schedules_running": self._cron_enabled and not self._stopping,
+                "jobs": [
+                    {
+                        "name": job.name,
+                        "description": job.description,
+                        "params": list(job.params),
+                        "schedule": job.cron.expression if job.cron else None,
+                        "next_run": job.next_run.isoformat() if job.next_run else None,
+                        "concurrency": job.concurrency,
+                        "max_retries": job.max_retries,
+                        "running": job.running,
+                        "runs": job.runs,
+                        "failures": job.failures,
+                        "retries": job.retries,
+                        "last_run": job.last_run,
+                    }
+                    for job in self.jobs.values()
+                ],
+                "recent_runs": [run.to_dict() for run in list(self._runs.values())[-recent:]][::-1],
+            }
+
+
+scheduler = Scheduler(SCHEDULER_WORKERS, SCHEDULER_MAX_QUEUE, SCHEDULER_HISTORY)
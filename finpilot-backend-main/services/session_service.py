@@ -0,0 +1,104 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+from config import REVOKED_TOKEN_CACHE_SIZE, SESSION_SECRET, SESSION_TTL_SECONDS
+
+# Session tokens are "<payload>.<signature>", both URL-safe base64:
+# payload = {"sub": user_id, "iat": issued, "exp": expires, "jti": token id}
+# signature = HMAC-SHA256(SESSION_SECRET, payload). Verifying one is a local
+# HMAC check plus a lookup in the revocation cache, never a database read.
+
+_SECRET = SESSION_SECRET.encode("utf-8")
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_SECRET, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+class RevokedTokens:
+    """
+    Token IDs revoked before their expiry, kept only until they would have
+    expired anyway. In-process like the response cache: with several
+    workers, a logout is enforced by the worker that handled it.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[jti] = expires_at
+            self._prune()
+
+    def __contains__(self, jti: str) -> bool:
+        with self._lock:
+            return jti in self._entries
+
+    def _prune(self) -> None:
+        now = time.time()
+        # Every token lives SESSION_TTL_SECONDS, so insertion order is
+        # (nearly) expiry order and expired entries sit at the front
+        while self._entries:
+            jti, expires_at = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[jti]
+
+
+revoked = RevokedTokens(REVOKED_TOKEN_CACHE_SIZE)
+
+
+def issue_token(user_id: str) -> Tuple[str, int]:
+    """Returns (token, expires_at as a unix timestamp)."""
+    now = int(time.time())
+    claims = {"sub": user_id, "iat": now, "exp": now + SESSION_TTL_SECONDS, "jti": secrets.token_urlsafe(12)}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}", claims["exp"]
+
+
+def decode_token(token: str) -> dict:
+    """Checks signature, expiry and revocation; returns the claims."""
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise InvalidToken("Invalid session token")
+        claims = json.loads(_b64decode(payload))
+    except InvalidToken:
+        raise
+    except Exception:
+        raise InvalidToken("Invalid session token")
+
+    if claims.get("exp", 0) <= time.time():
+        raise InvalidToken("Session expired")
+    if claims.get("jti") in revoked:
+        raise InvalidToken("Session revoked")
+    return claims
+
+
+def verify_token(token: str) -> str:
+    return decode_token(token)["sub"]
+
+
+def revoke_token(token: str) -> None:
+    claims = decode_token(token)
+    revoked.add(claims["jti"], claims["exp"])
@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+# Startup timing, phase by phase ("import: routers", "init: firebase", ...).
+# main.py imports this first, so the clock starts with the app's own imports;
+# the report is printed once the lifespan startup finishes and stays
+# available at GET /startup/stats.
+
+_started = time.perf_counter()
+_phases: List[Tuple[str, float]] = []
+_ready: Optional[float] = None
+
+
+@contextmanager
+def phase(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - start))
+
+
+def mark_ready() -> None:
+    global _ready
+    _ready = time.perf_counter() - _started
+    print("🚀 Ready in " + _format(_ready) + " (" + ", ".join(
+        f"{name} {_format(seconds)}" for name, seconds in _phases
+    ) + ")")
+
+
+def _format(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
+def report() -> dict:
+    return {
+        "ready": _ready is not None,
+        "total_ms": round(_ready * 1000, 1) if _ready is not None else None,
+        "phases": [{"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in _phases],
+    }
@@ -0,0 +1,201 @@
+import heapq
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from storage import get_storage, get_async_storage
+from services.ai_service import assess_financial_health
+from services.query_service import month_bounds
+from config import WARNINGS_ENABLED, WARNING_DEBOUNCE_SECONDS, WARNING_SETTLE_SECONDS, WARNING_WORKERS
+
+# Financial-health checks run after a transaction write, never inside it:
+# the write only notes that the user needs a check, and a background worker
+# evaluates and stores the result for GET /dashboard/warning to read.
+
+logger = logging.getLogger("finpilot.warnings")
+
+
+def evaluate(user_id: str, as_of: str) -> dict:
+    """
+    Runs the check for the month of `as_of` ("YYYY-MM-DD") and stores it.
+    Reads the month's allocation and rollup, the previous month's rollup
+    and the last 7 days of transactions.
+    """
+    storage = get_storage()
+    day = date.fromisoformat(as_of)
+    month = as_of[:7]
+    month_start, next_month = (date.fromisoformat(d) for d in month_bounds(month))
+    previous_month_end = month_start - timedelta(days=1)
+
+    allocation = storage.get_allocation(user_id, month)
+    rollup = storage.get_monthly_rollup(user_id, month)
+    previous = storage.get_monthly_rollup(user_id, previous_month_end.isoformat()[:7])
+    week = storage.list_transactions(
+        user_id, start=(day - timedelta(days=6)).isoformat(), end=(day + timedelta(days=1)).isoformat()
+    )
+
+    trend = {
+        "last_7_days_spent": sum(t.get("amount", 0) for t in week if t.get("type") == "debit"),
+        "days_left": (next_month - day).days - 1,
+    }
+    habits = {
+        "previous_month_spent": previous.get("total_debit", 0),
+        "previous_month_days": previous_month_end.day,
+    }
+    balance = sum((allocation or {}).get("categories", {}).values()) - rollup.get("total_debit", 0)
+
+    if allocation is None:
+        result = {"status": 0, "reason": f"No salary set for {month}, so there is no budget to check against."}
+    else:
+        result = assess_financial_health(habits, trend, balance)
+
+    warning = {
+        **result,
+        "month": month,
+        "as_of": as_of,
+        "balance": balance,
+        **trend,
+        "evaluated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    storage.save_health_warning(user_id, warning)
+    return warning
+
+
+class WarningScheduler:
+    """
+    Per-user debounce: a user's first write schedules one evaluation
+    `settle` seconds later, and never sooner than `debounce` seconds after
+    their previous one started. Writes arriving while it is pending only
+    move its as_of date forward; writes arriving while it runs schedule
+    exactly one follow-up.
+    """
+
+    def __init__(self, evaluate: Callable[[str, str], dict], debounce: float, settle: float, workers: int):
+        self._evaluate = evaluate
+        self.debounce = debounce
+        self.settle = settle
+        self.workers = workers
+        # user_id -> {"as_of", "due", "running", "dirty", "last_started"}
+        self._users: Dict[str, dict] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._prune_at = 1024
+        self.notified = 0
+        self.coalesced = 0
+        self.evaluations = 0
+        self.failures = 0
+
+    def notify(self, user_id: str, as_of: str) -> None:
+        with self._cond:
+            self.notified += 1
+            state = self._users.get(user_id)
+            if state is None:
+                state = self._users[user_id] = {
+                    "as_of": as_of, "due": None, "running": False, "dirty": False, "last_started": None,
+                }
+            state["as_of"] = max(state["as_of"], as_of)
+            if state["due"] is not None:
+                self.coalesced += 1
+            elif state["running"]:
+                self.coalesced += 1
+                state["dirty"] = True
+            else:
+                self._schedule(user_id, state)
+            if len(self._users) > self._prune_at:
+                self._prune()
+
+    def _schedule(self, user_id: str, state: dict) -> None:
+        # Caller holds the condition
+        due = time.monotonic() + self.settle
+        if state["last_started"] is not None:
+            due = max(due, state["last_started"] + self.debounce)
+        state["due"] = due
+        heapq.heappush(self._heap, (due, user_id))
+        if self._thread is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="health-warning")
+            self._thread = threading.Thread(target=self._dispatch, name="health-warning-scheduler", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def _prune(self) -> None:
+        # Idle users whose debounce window has passed need no state
+        now = time.monotonic()
+        for user_id, state in list(self._users.items()):
+            if state["due"] is None and not state["running"] and state["last_started"] + self.debounce <= now:
+                del self._users[user_id]
+        self._prune_at = max(1024, 2 * len(self._users))
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, user_id = heapq.heappop(self._heap)
+                state = self._users[user_id]
+                state.update(due=None, running=True, dirty=False, last_started=time.monotonic())
+                as_of = state["as_of"]
+            self._pool.submit(self._run, user_id, as_of)
+
+    def _run(self, user_id: str, as_of: str) -> None:
+        try:
+            self._evaluate(user_id, as_of)
+            failed = False
+        except Exception as e:
+            failed = True
+            logger.warning(json.dumps({
+                "event": "health_warning_failed",
+                "user_id": user_id,
+                "as_of": as_of,
+                "error": f"{type(e).__name__}: {e}",
+            }))
+        with self._cond:
+            if failed:
+                self.failures += 1
+            else:
+                self.evaluations += 1
+            state = self._users[user_id]
+            state["running"] = False
+            if state["dirty"]:
+                state["dirty"] = False
+                self._schedule(user_id, state)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "enabled": WARNINGS_ENABLED,
+                "debounce_seconds": self.debounce,
+                "pending": len(self._heap),
+                "running": sum(1 for s in self._users.values() if s["running"]),
+                "notified": self.notified,
+                "coalesced": self.coalesced,
+                "evaluations": self.evaluations,
+                "failures": self.failures,
+            }
+
+
+scheduler = WarningScheduler(evaluate, WARNING_DEBOUNCE_SECONDS, WARNING_SETTLE_SECONDS, WARNING_WORKERS)
+
+
+def notify_transactions(txns: List[dict]) -> None:
+    """Called after transactions are committed; returns immediately."""
+    if not WARNINGS_ENABLED:
+        return
+    latest: Dict[str, str] = {}
+    for txn in txns:
+        latest[txn["user_id"]] = max(latest.get(txn["user_id"], ""), txn["date"])
+    for user_id, as_of in latest.items():
+        scheduler.notify(user_id, as_of)
+
+
+def get_warning(user_id: str) -> Optional[dict]:
+    return get_storage().get_health_warning(user_id)
+
+
+async def get_warning_async(user_id: str) -> Optional[dict]:
+    return await get_async_storage().get_health_warning(user_id)
@@ -1,5 +1,9 @@
-from database import db
+import asyncio
+from storage import get_storage, get_async_storage
+from services.query_service import year_bounds
+from services.read_budget_service import ReadBudgetExceeded, lookahead, row_limit
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 CATEGORY_ICONS = {
@@ -31,41 +35,72 @@ FUN_COMPARISONS = [
 
 def get_wrapped_summary(user_id: str, year: int):
     """Generate a year-end wrapped summary for a user."""
-    year_str = str(year)
+    storage = get_storage()
 
-    # ── 1. Fetch all transactions for the year ──
-    txns_ref = db.collection("transactions").where("user_id", "==", user_id).stream()
-    
-    all_transactions = []
-    for doc in txns_ref:
-        t = doc.to_dict()
-        t["id"] = doc.id
-        if t.get("date", "").startswith(year_str):
-            all_transactions.append(t)
-
-    # ── 2. Fetch all salaries for the year ──
-    salaries_ref = db.collection("salaries").where("user_id", "==", user_id).stream()
+    # ── 1. Serve the stored snapshot while no new data has arrived for the year ──
+    snapshot = storage.get_wrapped_snapshot(user_id, year) or {}
+    version = snapshot.get("version", 0)
+    if snapshot.get("summary") is not None and snapshot.get("computed_version") == version:
+        return snapshot["summary"]
+
+    # ── 2-4. Fetch transactions, salaries, goals and user concurrently ──
+    start, end = year_bounds(year)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        all_transactions = pool.submit(lambda: list(storage.list_transactions(user_id, start=start, end=end)))
+        salaries = pool.submit(storage.list_salaries, user_id, start_month=f"{year}-01", end_month=f"{year + 1}-01")
+        goals = pool.submit(storage.list_goals, user_id)
+        user = pool.submit(storage.get_user, user_id)
+
+    summary = _build_wrapped_summary(
+        year, all_transactions.result(), salaries.result(), goals.result(), user.result()
+    )
+    # Saved against the version read in step 1: a write that landed meanwhile
+    # has already bumped it, so this snapshot is recomputed on the next call
+    storage.save_wrapped_snapshot(user_id, year, summary, version)
+    return summary
+
+
+async def get_wrapped_summary_async(user_id: str, year: int):
+    """Async variant: the four independent reads run concurrently."""
+    storage = get_async_storage()
+    snapshot = await storage.get_wrapped_snapshot(user_id, year) or {}
+    version = snapshot.get("version", 0)
+    if snapshot.get("summary") is not None and snapshot.get("computed_version") == version:
+        return snapshot["summary"]
+
+    start, end = year_bounds(year)
+    limit = row_limit()
+
+    async def fetch_transactions():
+        txns = storage.list_transactions(user_id, start=start, end=end, limit=lookahead(limit))
+        rows = [t async for t in txns]
+        if limit is not None and len(rows) > limit:
+            raise ReadBudgetExceeded(f"The {year} summary needs more than {limit} transaction reads")
+        return rows
+
+    try:
+        all_transactions, salaries, goals, user = await asyncio.gather(
+            fetch_transactions(),
+            storage.list_salaries(user_id, start_month=f"{year}-01", end_month=f"{year + 1}-01"),
+            storage.list_goals(user_id),
+            storage.get_user(user_id),
+        )
+    except ReadBudgetExceeded:
+        # A summary cannot be cut short like a list. Serve the stale snapshot
+        # if there is one; the precompute job (not budgeted) refreshes it.
+        if snapshot.get("summary") is not None:
+            return snapshot["summary"]
+        raise
+    summary = _build_wrapped_summary(year, all_transactions, salaries, goals, user)
+    await storage.save_wrapped_snapshot(user_id, year, summary, version)
+    return summary
+
+
+def _build_wrapped_summary(year: int, all_transactions: list, salaries: list, goals: list, user: dict):
     monthly_income = {}
-    for doc in salaries_ref:
-        s = doc.to_dict()
-        month = s.get("month", "")
-        if month.startswith(year_str):
-            monthly_income[month] = s.get("amount", 0)
-
-    # ── 3. Fetch goals ──
-    goals_ref = db.collection("savings_goals").where("user_id", "==", user_id).stream()
-    goals = []
-    for doc in goals_ref:
-        g = doc.to_dict()
-        g["id"] = doc.id
-        goals.append(g)
-
-    # ── 4. Fetch user name ──
-    users_ref = db.collection("users").where("user_id", "==", user_id).limit(1).stream()
-    user_name = "User"
-    for doc in users_ref:
-        u = doc.to_dict()
-        user_name = u.get("name", "User")
+    for s in salaries:
+        monthly_income[s.get("month", "")] = s.get("amount", 0)
+    user_name = user.get("name", "User") if user else "User"
 
     # ── 5. Process transactions ──
     total_income = 0.0
@@ -107,7 +142,7 @@ def get_wrapped_summary(user_id: str, year: int):
                     "amount": amount,
                     "category": category,
                     "date": date_str,
-                    "description": t.get("description", ""),
+                    "description": t.get("description") or "",
                 }
 
     # Salary-based income
@@ -0,0 +1,66 @@
+import threading
+from typing import Optional
+from config import STORAGE_BACKEND, SQLITE_PATH
+from storage.base import AsyncStorageBackend, EmailTaken, StorageBackend, email_key
+
+_storage: Optional[StorageBackend] = None
+_async_storage: Optional[AsyncStorageBackend] = None
+# Reentrant: building the async SQLite facade calls get_storage()
+_lock = threading.RLock()
+
+
+def _create_storage(backend: str) -> StorageBackend:
+    if backend == "firestore":
+        # Imported lazily: only the Firestore backend needs credentials
+        from database import db
+        from storage.firestore_backend import FirestoreStorage
+        return FirestoreStorage(db)
+    if backend in ("sqlite", "memory"):
+        from storage.sqlite_backend import SQLiteStorage
+        return SQLiteStorage(":memory:" if backend == "memory" else SQLITE_PATH)
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (expected firestore, sqlite or memory)")
+
+
+def _create_async_storage(backend: str) -> AsyncStorageBackend:
+    if backend == "firestore":
+        from database import async_db
+        from storage.firestore_async_backend import AsyncFirestoreStorage
+        return AsyncFirestoreStorage(async_db)
+    # SQLite has no async driver here; share the sync backend (and its data)
+    from storage.threaded_backend import ThreadedAsyncStorage
+    return ThreadedAsyncStorage(get_storage())
+
+
+def get_storage() -> StorageBackend:
+    """
+    Returns the process-wide storage backend selected by STORAGE_BACKEND.
+    """
+    global _storage
+    if _storage is None:
+        with _lock:
+            if _storage is None:
+                _storage = _create_storage(STORAGE_BACKEND)
+    return _storage
+
+
+def get_async_storage() -> AsyncStorageBackend:
+    """
+    Async counterpart of get_storage() used by the async routes.
+    """
+    global _async_storage
+    if _async_storage is None:
+        with _lock:
+            if _async_storage is None:
+                _async_storage = _create_async_storage(STORAGE_BACKEND)
+    return _async_storage
+
+
+def set_storage(storage: StorageBackend) -> None:
+    """
+    Swaps the active backend (benchmarks and load tests seed their own).
+    The async path runs on top of the same instance.
+    """
+    from storage.threaded_backend import ThreadedAsyncStorage
+    global _storage, _async_storage
+    _storage = storage
+    _async_storage = ThreadedAsyncStorage(storage)
@@ -0,0 +1,241 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+# Transactions, salaries, goals and users are plain dicts. Every record a
+# backend returns carries its document ID under "id".
+# Date windows are half-open: start inclusive, end exclusive ("YYYY-MM-DD").
+
+
+class EmailTaken(ValueError):
+    def __init__(self):
+        super().__init__("User with this email already exists")
+
+
+def email_key(email: str) -> str:
+    """
+    Normalized email, used as the ID of its user_emails index entry.
+    Quoting keeps characters Firestore forbids in IDs (such as "/") out.
+    """
+    return quote(email.strip().lower(), safe="@")
+
+
+class StorageBackend(ABC):
+    """
+    Every query the services run, independent of where the data lives.
+    """
+
+    # ── Transactions ──
+    @abstractmethod
+    def add_transaction(self, txn: dict) -> str:
+        """Stores a transaction and folds it into its monthly rollup atomically."""
+
+    @abstractmethod
+    def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        """
+        Bulk insert. Returns, per input position, the new ID or the exception
+        that made its write batch fail (other batches are unaffected).
+        """
+
+    @abstractmethod
+    def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[dict]:
+        """
+        Transactions ordered by (date, id). `after` is a (date, id) pair from
+        a previous page; results resume strictly after it.
+        """
+
+    @abstractmethod
+    def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        """Spend per category, debit/credit totals and count for one month."""
+
+    # ── Salaries & allocations ──
+    @abstractmethod
+    def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        """
+        Upserts the month's salary and allocation (both keyed by user and
+        month) in one atomic write; resubmitting a month overwrites it.
+        """
+
+    @abstractmethod
+    def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        """
+        Bulk set_salary for rows of {user_id, month, amount, categories}.
+        Returns, per input position, the "{user_id}_{month}" record ID or
+        the exception that made its write batch fail.
+        """
+
+    @abstractmethod
+    def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        pass
+
+    # ── Savings goals ──
+    @abstractmethod
+    def add_goal(self, goal: dict) -> str:
+        """Goals count towards every year, so all of the user's snapshots go stale."""
+
+    @abstractmethod
+    def list_goals(self, user_id: str) -> List[dict]:
+        pass
+
+    # ── Users ──
+    # Each user has a user_emails entry keyed by email_key(email), written
+    # atomically with the user, so emails stay unique and lookups are gets.
+    @abstractmethod
+    def create_user(self, user: dict) -> str:
+        """Raises EmailTaken if the (normalized) email is already registered."""
+
+    @abstractmethod
+    def get_user(self, user_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        """
+        Direct get through the email index. While EMAIL_INDEX_FALLBACK is on,
+        users created before the index existed are found by a query once and
+        backfilled into it.
+        """
+
+    # ── Wrapped snapshots ──
+    # Every write that can change a user's Wrapped for a year bumps that
+    # (user, year) snapshot's "version" atomically with the write itself.
+    @abstractmethod
+    def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        """{"version": int, "computed_version": int | None, "summary": dict | None}"""
+
+    @abstractmethod
+    def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        """Stores a summary computed from data as of `version` (never touches version)."""
+
+    # ── Financial-health warnings ──
+    # One document per user, replaced by each background evaluation
+    @abstractmethod
+    def get_health_warning(self, user_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def save_health_warning(self, user_id: str, warning: dict) -> None:
+        pass
+
+    # ── One-off migrations (run as background jobs, see migration_service) ──
+    @abstractmethod
+    def normalize_transaction_dates(self) -> int:
+        """
+        Rewrites transactions stored with unpadded dates ("2026-2-5") as
+        "YYYY-MM-DD" so date-range queries find them, and has the rollups
+        and Wrapped snapshots they belong to rebuilt. Returns rows fixed.
+        """
+
+    @abstractmethod
+    def backfill_email_index(self) -> int:
+        """
+        Adds the user_emails entry of every user that has none (users from
+        before the index). Returns the number of entries added.
+        """
+
+
+class AsyncStorageBackend(ABC):
+    """
+    Coroutine twin of StorageBackend for the async request path.
+    list_transactions is an async generator; everything else is awaited.
+    """
+
+    # ── Transactions ──
+    @abstractmethod
+    async def add_transaction(self, txn: dict) -> str:
+        pass
+
+    @abstractmethod
+    async def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        pass
+
+    @abstractmethod
+    def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> AsyncIterator[dict]:
+        pass
+
+    @abstractmethod
+    async def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        pass
+
+    # ── Salaries & allocations ──
+    @abstractmethod
+    async def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        pass
+
+    @abstractmethod
+    async def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        pass
+
+    @abstractmethod
+    async def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        pass
+
+    # ── Savings goals ──
+    @abstractmethod
+    async def add_goal(self, goal: dict) -> str:
+        pass
+
+    @abstractmethod
+    async def list_goals(self, user_id: str) -> List[dict]:
+        pass
+
+    # ── Users ──
+    @abstractmethod
+    async def create_user(self, user: dict) -> str:
+        pass
+
+    @abstractmethod
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        pass
+
+    # ── Wrapped snapshots ──
+    @abstractmethod
+    async def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        pass
+
+    # ── Financial-health warnings ──
+    @abstractmethod
+    async def get_health_warning(self, user_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def save_health_warning(self, user_id: str, warning: dict) -> None:
+        pass
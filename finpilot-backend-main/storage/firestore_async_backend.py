@@ -0,0 +1,176 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from google.cloud import firestore
+from config import EMAIL_INDEX_FALLBACK
+from storage.base import AsyncStorageBackend, EmailTaken
+from storage.firestore_backend import (
+    SALARY_ROWS_PER_BATCH, FirestoreLayout, _plan_batches, _seeded_rollup, _snapshot_view, _with_id,
+)
+
+
+class AsyncFirestoreStorage(FirestoreLayout, AsyncStorageBackend):
+    """
+    FirestoreStorage on top of firestore.AsyncClient, so requests await
+    gRPC calls on the event loop instead of holding a threadpool worker.
+    Documents, queries and batches come from the shared FirestoreLayout.
+    """
+
+    # ── Transactions ──
+    async def add_transaction(self, txn: dict) -> str:
+        batch = self.db.batch()
+        doc_ref = self._stage_transactions(batch, [txn])[0]
+        await batch.commit()
+        return doc_ref.id
+
+    async def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        async def commit(chunk: List[int]):
+            batch = self.db.batch()
+            refs = self._stage_transactions(batch, [txns[i] for i in chunk])
+            try:
+                await batch.commit()
+                return [ref.id for ref in refs]
+            except Exception as e:
+                return [e] * len(chunk)
+
+        # Chunks are independent commits, so they go out concurrently
+        chunks = _plan_batches(txns)
+        outcomes = await asyncio.gather(*(commit(chunk) for chunk in chunks))
+        results: List[Union[str, Exception]] = [None] * len(txns)
+        for chunk, outcome in zip(chunks, outcomes):
+            for i, value in zip(chunk, outcome):
+                results[i] = value
+        return results
+
+    async def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> AsyncIterator[dict]:
+        query = self._transactions_query(user_id, start, end, category, descending, limit, after)
+        async for doc in query.stream():
+            yield _with_id(doc)
+
+    async def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        snapshot = await self._rollup_ref(user_id, month).get()
+        if snapshot.exists:
+            rollup = snapshot.to_dict()
+            if rollup.get("seeded"):
+                return rollup
+
+        # Same once-per-month seeding as FirestoreStorage._seed_monthly_rollup
+        @firestore.async_transactional
+        async def seed(transaction):
+            rollup_ref = self._rollup_ref(user_id, month)
+            snapshot = await rollup_ref.get(transaction=transaction)
+            if snapshot.exists and snapshot.to_dict().get("seeded"):
+                return snapshot.to_dict()
+
+            docs = await transaction.get(self._month_query(user_id, month))
+            rollup = _seeded_rollup(user_id, month, [doc.to_dict() async for doc in docs])
+            transaction.set(rollup_ref, rollup)
+            return rollup
+
+        return await seed(self.db.transaction())
+
+    # ── Salaries & allocations ──
+    async def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        batch = self.db.batch()
+        self._stage_salaries(batch, [
+            {"user_id": user_id, "month": month, "amount": amount, "categories": categories}
+        ])
+        await batch.commit()
+
+    async def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        async def commit(chunk: List[dict]):
+            batch = self.db.batch()
+            record_ids = self._stage_salaries(batch, chunk)
+            try:
+                await batch.commit()
+                return record_ids
+            except Exception as e:
+                return [e] * len(chunk)
+
+        chunks = [rows[i:i + SALARY_ROWS_PER_BATCH] for i in range(0, len(rows), SALARY_ROWS_PER_BATCH)]
+        outcomes = await asyncio.gather(*(commit(chunk) for chunk in chunks))
+        return [value for outcome in outcomes for value in outcome]
+
+    async def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        return [_with_id(doc) async for doc in self._salaries_query(user_id, start_month, end_month).stream()]
+
+    async def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        snapshot = await self._allocation_ref(user_id, month).get()
+        if snapshot.exists:
+            return _with_id(snapshot)
+        async for doc in self._legacy_allocation_query(user_id, month).stream():
+            return _with_id(doc)
+        return None
+
+    # ── Savings goals ──
+    async def add_goal(self, goal: dict) -> str:
+        snapshots = [s async for s in self._user_snapshots_query(goal["user_id"]).stream()]
+        batch = self.db.batch()
+        goal_id = self._stage_goal(batch, goal, snapshots)
+        await batch.commit()
+        return goal_id
+
+    async def list_goals(self, user_id: str) -> List[dict]:
+        return [_with_id(doc) async for doc in self._goals_query(user_id).stream()]
+
+    # ── Wrapped snapshots ──
+    async def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        return _snapshot_view(await self._snapshot_ref(user_id, year).get())
+
+    async def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        await self._snapshot_ref(user_id, year).set(
+            self._snapshot_summary(user_id, year, summary, version), merge=True
+        )
+
+    # ── Financial-health warnings ──
+    async def get_health_warning(self, user_id: str) -> Optional[dict]:
+        snapshot = await self._warning_ref(user_id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
+    async def save_health_warning(self, user_id: str, warning: dict) -> None:
+        await self._warning_ref(user_id).set({**warning, "user_id": user_id})
+
+    # ── Users ──
+    async def create_user(self, user: dict) -> str:
+        new_user_ref = self._user_ref()
+        email_ref = self._email_ref(user["email"])
+
+        # Same uniqueness transaction as FirestoreStorage.create_user
+        @firestore.async_transactional
+        async def create(transaction):
+            if (await email_ref.get(transaction=transaction)).exists:
+                raise EmailTaken()
+            if EMAIL_INDEX_FALLBACK:
+                async for _ in await transaction.get(self._legacy_user_query(user["email"])):
+                    raise EmailTaken()
+            self._stage_user(transaction, new_user_ref, user)
+
+        await create(self.db.transaction())
+        return new_user_ref.id
+
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        snapshot = await self._user_ref(user_id).get()
+        return _with_id(snapshot) if snapshot.exists else None
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        email_ref = self._email_ref(email)
+        entry = await email_ref.get()
+        if entry.exists:
+            return await self.get_user(entry.to_dict()["user_id"])
+        if not EMAIL_INDEX_FALLBACK:
+            return None
+
+        async for doc in self._legacy_user_query(email).stream():
+            await email_ref.set({"user_id": doc.id, "email": email})
+            return _with_id(doc)
+        return None
@@ -0,0 +1,488 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+from config import EMAIL_INDEX_FALLBACK
+from services.query_service import month_bounds, normalize_date
+from storage.base import EmailTaken, StorageBackend, email_key
+
+# Transaction dates are stored as zero-padded "YYYY-MM-DD" strings, so the
+# lexical order Firestore uses for range filters is also chronological order.
+# The composite indexes these queries need live in firestore.indexes.json.
+# FirestoreLayout holds everything about where documents live and what they
+# contain; FirestoreStorage and AsyncFirestoreStorage only differ in how they
+# call the client (blocking or awaited).
+
+
+# Firestore rejects write batches with more than 500 operations
+MAX_BATCH_OPS = 500
+
+
+def _rollup_increments(txns: List[dict]) -> Dict[Tuple[str, str], dict]:
+    """
+    Merges many transactions into one rollup payload per (user, month), so a
+    bulk import costs one rollup write per month instead of one per row.
+    """
+    rollups: Dict[Tuple[str, str], dict] = {}
+    for txn in txns:
+        key = (txn["user_id"], txn["date"][:7])
+        totals = rollups.setdefault(key, {"count": 0, "debit": 0, "credit": 0, "spent": {}})
+        amount = txn.get("amount", 0)
+        totals["count"] += 1
+        if txn.get("type") == "debit":
+            totals["debit"] += amount
+            cat = txn.get("category", "misc")
+            totals["spent"][cat] = totals["spent"].get(cat, 0) + amount
+        elif txn.get("type") == "credit":
+            totals["credit"] += amount
+
+    payloads = {}
+    for (user_id, month), totals in rollups.items():
+        update = {
+            "user_id": user_id,
+            "month": month,
+            "transaction_count": firestore.Increment(totals["count"]),
+        }
+        if totals["debit"]:
+            update["total_debit"] = firestore.Increment(totals["debit"])
+            update["spent"] = {cat: firestore.Increment(amt) for cat, amt in totals["spent"].items()}
+        if totals["credit"]:
+            update["total_credit"] = firestore.Increment(totals["credit"])
+        payloads[(user_id, month)] = update
+    return payloads
+
+
+def _seeded_rollup(user_id: str, month: str, txns: Iterable[dict]) -> dict:
+    """A month's rollup computed from all of its transactions."""
+    rollup = {
+        "user_id": user_id,
+        "month": month,
+        "spent": {},
+        "total_debit": 0,
+        "total_credit": 0,
+        "transaction_count": 0,
+        "seeded": True,
+    }
+    for t in txns:
+        amt = t.get("amount", 0)
+        rollup["transaction_count"] += 1
+        if t.get("type") == "debit":
+            cat = t.get("category", "misc")
+            rollup["spent"][cat] = rollup["spent"].get(cat, 0) + amt
+            rollup["total_debit"] += amt
+        elif t.get("type") == "credit":
+            rollup["total_credit"] += amt
+    return rollup
+
+
+def _version_bump(user_id: str, year: int) -> dict:
+    # Marks the (user, year) Wrapped snapshot as out of date
+    return {"user_id": user_id, "year": year, "version": firestore.Increment(1)}
+
+
+def _snapshot_keys(txns: List[dict]) -> set:
+    return {(txn["user_id"], int(txn["date"][:4])) for txn in txns}
+
+
+def _plan_batches(txns: List[dict]) -> List[List[int]]:
+    """
+    Splits input positions into chunks whose transaction writes, rollup
+    writes and snapshot version bumps fit within MAX_BATCH_OPS.
+    """
+    chunks, current, months, years = [], [], set(), set()
+    for index, txn in enumerate(txns):
+        month_key = (txn["user_id"], txn["date"][:7])
+        year_key = (txn["user_id"], int(txn["date"][:4]))
+        extra_ops = 1 + (month_key not in months) + (year_key not in years)
+        if current and len(current) + len(months) + len(years) + extra_ops > MAX_BATCH_OPS:
+            chunks.append(current)
+            current, months, years = [], set(), set()
+        current.append(index)
+        months.add(month_key)
+        years.add(year_key)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# A salary row is a salary write, an allocation write and at most one
+# snapshot version bump
+SALARY_ROWS_PER_BATCH = MAX_BATCH_OPS // 3
+
+
+def _snapshot_view(snapshot) -> Optional[dict]:
+    if not snapshot.exists:
+        return None
+    data = snapshot.to_dict()
+    return {
+        "version": data.get("version", 0),
+        "computed_version": data.get("computed_version"),
+        "summary": data.get("summary"),
+    }
+
+
+def _with_id(doc) -> dict:
+    return {**doc.to_dict(), "id": doc.id}
+
+
+class FirestoreLayout:
+    """
+    References, queries and staged writes shared by the sync and async
+    Firestore backends. Works with either client: building references and
+    staging batch writes never does I/O.
+    """
+
+    def __init__(self, client):
+        self.db = client
+
+    # ── Transactions ──
+    def _transactions_query(
+        self, user_id, start=None, end=None, category=None, descending=False, limit=None, after=None,
+    ):
+        query = self.db.collection("transactions").where("user_id", "==", user_id)
+        if category is not None:
+            query = query.where("category", "==", category)
+        if start is not None:
+            query = query.where("date", ">=", start)
+        if end is not None:
+            query = query.where("date", "<", end)
+        direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+        # Document ID breaks ties between same-day transactions so cursors are stable
+        query = query.order_by("date", direction=direction)\
+            .order_by(FieldPath.document_id(), direction=direction)
+        if after is not None:
+            query = query.start_after({"date": after[0], "__name__": after[1]})
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def _month_query(self, user_id: str, month: str):
+        start, end = month_bounds(month)
+        return self._transactions_query(user_id, start, end)
+
+    def _rollup_ref(self, user_id: str, month: str):
+        # One rollup document per user per month, keyed deterministically
+        return self.db.collection("monthly_rollups").document(f"{user_id}_{month}")
+
+    def _snapshot_ref(self, user_id: str, year: int):
+        return self.db.collection("wrapped_snapshots").document(f"{user_id}_{year}")
+
+    def _stage_transactions(self, batch, txns: List[dict]) -> list:
+        """
+        Adds the transactions, their monthly rollup increments and snapshot
+        version bumps to `batch`, so the rollups can never drift from the
+        underlying documents. Returns the new documents' references.
+        """
+        refs = []
+        for txn in txns:
+            doc_ref = self.db.collection("transactions").document()
+            batch.set(doc_ref, txn)
+            refs.append(doc_ref)
+        for (user_id, month), update in _rollup_increments(txns).items():
+            batch.set(self._rollup_ref(user_id, month), update, merge=True)
+        for user_id, year in _snapshot_keys(txns):
+            batch.set(self._snapshot_ref(user_id, year), _version_bump(user_id, year), merge=True)
+        return refs
+
+    # ── Salaries & allocations ──
+    def _stage_salaries(self, batch, rows: List[dict]) -> List[str]:
+        """
+        Adds the (user, month)-keyed salary and allocation writes for `rows`
+        to `batch` and returns their record IDs.
+        """
+        record_ids = []
+        for row in rows:
+            record_id = f"{row['user_id']}_{row['month']}"
+            batch.set(self.db.collection("salaries").document(record_id), {
+                "user_id": row["user_id"],
+                "amount": row["amount"],
+                "month": row["month"],
+                "updated_at": firestore.SERVER_TIMESTAMP
+            })
+            batch.set(self.db.collection("allocations").document(record_id), {
+                "user_id": row["user_id"],
+                "month": row["month"],
+                "categories": row["categories"]
+            })
+            record_ids.append(record_id)
+        for user_id, year in {(row["user_id"], int(row["month"][:4])) for row in rows}:
+            batch.set(self._snapshot_ref(user_id, year), _version_bump(user_id, year), merge=True)
+        return record_ids
+
+    def _salaries_query(self, user_id: str, start_month: Optional[str], end_month: Optional[str]):
+        query = self.db.collection("salaries").where("user_id", "==", user_id)
+        if start_month is not None:
+            query = query.where("month", ">=", start_month)
+        if end_month is not None:
+            query = query.where("month", "<", end_month)
+        return query
+
+    def _allocation_ref(self, user_id: str, month: str):
+        return self.db.collection("allocations").document(f"{user_id}_{month}")
+
+    def _legacy_allocation_query(self, user_id: str, month: str):
+        # Allocations saved before deterministic IDs have auto IDs
+        return self.db.collection("allocations")\
+            .where("user_id", "==", user_id)\
+            .where("month", "==", month)\
+            .limit(1)
+
+    # ── Savings goals ──
+    def _goals_query(self, user_id: str):
+        return self.db.collection("savings_goals").where("user_id", "==", user_id)
+
+    def _user_snapshots_query(self, user_id: str):
+        return self.db.collection("wrapped_snapshots").where("user_id", "==", user_id)
+
+    def _stage_goal(self, batch, goal: dict, snapshots) -> str:
+        # Goals count towards every year, so all of the user's snapshots go stale
+        doc_ref = self.db.collection("savings_goals").document()
+        batch.set(doc_ref, goal)
+        for snapshot in snapshots:
+            batch.update(snapshot.reference, {"version": firestore.Increment(1)})
+        return doc_ref.id
+
+    # ── Wrapped snapshots ──
+    @staticmethod
+    def _snapshot_summary(user_id: str, year: int, summary: dict, version: int) -> dict:
+        # Merged into the snapshot, leaving its version untouched
+        return {
+            "user_id": user_id,
+            "year": year,
+            "summary": summary,
+            "computed_version": version,
+            "computed_at": firestore.SERVER_TIMESTAMP,
+        }
+
+    # ── Financial-health warnings ──
+    def _warning_ref(self, user_id: str):
+        return self.db.collection("health_warnings").document(user_id)
+
+    # ── Users ──
+    def _user_ref(self, user_id: Optional[str] = None):
+        users = self.db.collection("users")
+        return users.document(user_id) if user_id is not None else users.document()
+
+    def _email_ref(self, email: str):
+        return self.db.collection("user_emails").document(email_key(email))
+
+    def _legacy_user_query(self, email: str):
+        # Users from before the index only exist in the users collection
+        return self.db.collection("users").where("email", "==", email).limit(1)
+
+    def _stage_user(self, transaction, user_ref, user: dict) -> None:
+        transaction.set(user_ref, {**user, "created_at": firestore.SERVER_TIMESTAMP})
+        transaction.set(self._email_ref(user["email"]), {"user_id": user_ref.id, "email": user["email"]})
+
+
+class FirestoreStorage(FirestoreLayout, StorageBackend):
+    # ── Transactions ──
+    def add_transaction(self, txn: dict) -> str:
+        batch = self.db.batch()
+        doc_ref = self._stage_transactions(batch, [txn])[0]
+        batch.commit()
+        return doc_ref.id
+
+    def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = [None] * len(txns)
+        for chunk in _plan_batches(txns):
+            batch = self.db.batch()
+            refs = self._stage_transactions(batch, [txns[i] for i in chunk])
+            try:
+                batch.commit()
+                outcome = [ref.id for ref in refs]
+            except Exception as e:
+                outcome = [e] * len(chunk)
+            for i, value in zip(chunk, outcome):
+                results[i] = value
+        return results
+
+    def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[dict]:
+        query = self._transactions_query(user_id, start, end, category, descending, limit, after)
+        for doc in query.stream():
+            yield _with_id(doc)
+
+    def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        snapshot = self._rollup_ref(user_id, month).get()
+        if snapshot.exists:
+            rollup = snapshot.to_dict()
+            if rollup.get("seeded"):
+                return rollup
+        return self._seed_monthly_rollup(self.db.transaction(), user_id, month)
+
+    def _seed_monthly_rollup(self, transaction, user_id: str, month: str) -> dict:
+        """
+        Rebuilds a rollup from the raw transactions, once per (user, month).
+        Rollups written before this month was seeded only hold the increments
+        of newer writes, so they are recomputed and then trusted afterwards.
+        Running inside a transaction means a concurrent add_transaction touching
+        the rollup forces a retry instead of being overwritten.
+        """
+        @firestore.transactional
+        def seed(transaction):
+            rollup_ref = self._rollup_ref(user_id, month)
+            snapshot = rollup_ref.get(transaction=transaction)
+            if snapshot.exists and snapshot.to_dict().get("seeded"):
+                return snapshot.to_dict()
+
+            docs = transaction.get(self._month_query(user_id, month))
+            rollup = _seeded_rollup(user_id, month, (doc.to_dict() for doc in docs))
+            transaction.set(rollup_ref, rollup)
+            return rollup
+
+        return seed(transaction)
+
+    # ── Salaries & allocations ──
+    def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        # Deterministic IDs: one salary and one allocation per user per month
+        batch = self.db.batch()
+        self._stage_salaries(batch, [
+            {"user_id": user_id, "month": month, "amount": amount, "categories": categories}
+        ])
+        batch.commit()
+
+    def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = []
+        for start in range(0, len(rows), SALARY_ROWS_PER_BATCH):
+            chunk = rows[start:start + SALARY_ROWS_PER_BATCH]
+            batch = self.db.batch()
+            record_ids = self._stage_salaries(batch, chunk)
+            try:
+                batch.commit()
+                results.extend(record_ids)
+            except Exception as e:
+                results.extend([e] * len(chunk))
+        return results
+
+    def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        return [_with_id(doc) for doc in self._salaries_query(user_id, start_month, end_month).stream()]
+
+    def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        snapshot = self._allocation_ref(user_id, month).get()
+        if snapshot.exists:
+            return _with_id(snapshot)
+        for doc in self._legacy_allocation_query(user_id, month).stream():
+            return _with_id(doc)
+        return None
+
+    # ── Savings goals ──
+    def add_goal(self, goal: dict) -> str:
+        snapshots = self._user_snapshots_query(goal["user_id"]).stream()
+        batch = self.db.batch()
+        goal_id = self._stage_goal(batch, goal, snapshots)
+        batch.commit()
+        return goal_id
+
+    def list_goals(self, user_id: str) -> List[dict]:
+        return [_with_id(doc) for doc in self._goals_query(user_id).stream()]
+
+    # ── Wrapped snapshots ──
+    def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        return _snapshot_view(self._snapshot_ref(user_id, year).get())
+
+    def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        self._snapshot_ref(user_id, year).set(
+            self._snapshot_summary(user_id, year, summary, version), merge=True
+        )
+
+    # ── Financial-health warnings ──
+    def get_health_warning(self, user_id: str) -> Optional[dict]:
+        snapshot = self._warning_ref(user_id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
+    def save_health_warning(self, user_id: str, warning: dict) -> None:
+        self._warning_ref(user_id).set({**warning, "user_id": user_id})
+
+    # ── One-off migrations ──
+    def normalize_transaction_dates(self) -> int:
+        # One full scan: rows written before dates were validated on input
+        writes, months, years = [], set(), set()
+        for doc in self.db.collection("transactions").stream():
+            txn = doc.to_dict()
+            stored = txn.get("date", "")
+            try:
+                normalized = normalize_date(stored)
+            except ValueError:
+                continue  # not a date at all; left for manual repair
+            if normalized == stored:
+                continue
+            writes.append((doc.reference, {"date": normalized}, False))
+            months.add((txn["user_id"], normalized[:7]))
+            years.add((txn["user_id"], int(normalized[:4])))
+
+        # Seeded rollups missed these rows: unseeding rebuilds them on next read
+        writes += [(self._rollup_ref(u, m), {"seeded": False}, True) for u, m in months]
+        writes += [(self._snapshot_ref(u, y), _version_bump(u, y), True) for u, y in years]
+        for start in range(0, len(writes), MAX_BATCH_OPS):
+            batch = self.db.batch()
+            for ref, data, merge in writes[start:start + MAX_BATCH_OPS]:
+                if merge:
+                    batch.set(ref, data, merge=True)
+                else:
+                    batch.update(ref, data)
+            batch.commit()
+        return len(writes) - len(months) - len(years)
+
+    def backfill_email_index(self) -> int:
+        # One full scan of the users and of the index's document IDs
+        indexed = {doc.id for doc in self.db.collection("user_emails").select([]).stream()}
+        entries = []
+        for doc in self.db.collection("users").stream():
+            email = doc.to_dict().get("email")
+            if not email or email_key(email) in indexed:
+                continue
+            # Legacy duplicates of one email: the first user found keeps it
+            indexed.add(email_key(email))
+            entries.append((self._email_ref(email), {"user_id": doc.id, "email": email}))
+        for start in range(0, len(entries), MAX_BATCH_OPS):
+            batch = self.db.batch()
+            for ref, entry in entries[start:start + MAX_BATCH_OPS]:
+                batch.set(ref, entry)
+            batch.commit()
+        return len(entries)
+
+    # ── Users ──
+    def create_user(self, user: dict) -> str:
+        new_user_ref = self._user_ref()
+        email_ref = self._email_ref(user["email"])
+
+        # Reading the index entry inside the transaction makes concurrent
+        # registrations of one email conflict: the loser retries and sees it
+        @firestore.transactional
+        def create(transaction):
+            if email_ref.get(transaction=transaction).exists:
+                raise EmailTaken()
+            if EMAIL_INDEX_FALLBACK:
+                for _ in transaction.get(self._legacy_user_query(user["email"])):
+                    raise EmailTaken()
+            self._stage_user(transaction, new_user_ref, user)
+
+        create(self.db.transaction())
+        return new_user_ref.id
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        snapshot = self._user_ref(user_id).get()
+        return _with_id(snapshot) if snapshot.exists else None
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        email_ref = self._email_ref(email)
+        entry = email_ref.get()
+        if entry.exists:
+            return self.get_user(entry.to_dict()["user_id"])
+        if not EMAIL_INDEX_FALLBACK:
+            return None
+
+        for doc in self._legacy_user_query(email).stream():
+            email_ref.set({"user_id": doc.id, "email": email})
+            return _with_id(doc)
+        return None
@@ -0,0 +1,157 @@
+import inspect
+from services.metrics_service import record_db
+
+# Wraps the Firestore client (sync or async) so every query, document read
+# and document write is counted for /metrics. The backends use it exactly
+# like the real client; anything not listed below passes straight through.
+
+BACKEND = "firestore"
+
+# Methods that return another collection, document or query to chain on
+_CHAINED = frozenset({
+    "collection", "collection_group", "document", "where", "order_by", "limit", "limit_to_last",
+    "offset", "select", "start_at", "start_after", "end_at", "end_before",
+})
+_READS = frozenset({"get", "stream", "get_all"})
+_WRITES = frozenset({"set", "create", "update", "delete", "add"})
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, _Instrumented) else value
+
+
+def _unwrap_args(args, kwargs):
+    return [_unwrap(a) for a in args], {k: _unwrap(v) for k, v in kwargs.items()}
+
+
+def _count_reads(result):
+    """
+    Counts the documents in a read result as they are consumed: a snapshot,
+    a list, a (async) generator, or an awaitable of any of these.
+    """
+    if inspect.isawaitable(result):
+        async def awaited():
+            return _count_reads(await result)
+        return awaited()
+    if isinstance(result, list):
+        record_db(BACKEND, reads=len(result))
+        return result
+    if hasattr(result, "__aiter__"):
+        async def counted_async():
+            async for doc in result:
+                record_db(BACKEND, reads=1)
+                yield doc
+        return counted_async()
+    if hasattr(result, "__next__"):
+        def counted():
+            for doc in result:
+                record_db(BACKEND, reads=1)
+                yield doc
+        return counted()
+    # A single document snapshot; Firestore bills missing documents too
+    record_db(BACKEND, reads=1)
+    return result
+
+
+class _Instrumented:
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __repr__(self):
+        return f"Instrumented({self._target!r})"
+
+    def _call(self, name, *args, **kwargs):
+        args, kwargs = _unwrap_args(args, kwargs)
+        return getattr(self._target, name)(*args, **kwargs)
+
+
+class _Reference(_Instrumented):
+    """A collection, document or query."""
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return _Reference(attr) if name == "parent" and attr is not None else attr
+        if name in _CHAINED:
+            return lambda *args, **kwargs: _Reference(self._call(name, *args, **kwargs))
+        if name in _READS:
+            def read(*args, **kwargs):
+                record_db(BACKEND, queries=1)
+                return _count_reads(self._call(name, *args, **kwargs))
+            return read
+        if name in _WRITES:
+            def write(*args, **kwargs):
+                record_db(BACKEND, writes=1)
+                return self._call(name, *args, **kwargs)
+            return write
+        return attr
+
+
+class _WriteBatch(_Instrumented):
+    """Counts staged writes when the batch commits."""
+
+    def __init__(self, target):
+        super().__init__(target)
+        self._pending = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in _WRITES:
+            def stage(*args, **kwargs):
+                self._pending += 1
+                return self._call(name, *args, **kwargs)
+            return stage
+        if name == "commit":
+            def commit(*args, **kwargs):
+                writes, self._pending = self._pending, 0
+                record_db(BACKEND, writes=writes)
+                return attr(*args, **kwargs)
+            return commit
+        return attr
+
+
+class _Transaction(_Instrumented):
+    """
+    Reads and writes made through the transaction. The SDK's transactional
+    decorators only touch its private attributes, which pass through.
+    """
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in _READS:
+            def read(*args, **kwargs):
+                record_db(BACKEND, queries=1)
+                return _count_reads(self._call(name, *args, **kwargs))
+            return read
+        if name in _WRITES:
+            def write(*args, **kwargs):
+                record_db(BACKEND, writes=1)
+                return self._call(name, *args, **kwargs)
+            return write
+        return attr
+
+
+class InstrumentedClient(_Instrumented):
+    """Drop-in wrapper for firestore.client() / firestore_async.client()."""
+
+    def collection(self, *args, **kwargs):
+        return _Reference(self._call("collection", *args, **kwargs))
+
+    def collection_group(self, *args, **kwargs):
+        return _Reference(self._call("collection_group", *args, **kwargs))
+
+    def document(self, *args, **kwargs):
+        return _Reference(self._call("document", *args, **kwargs))
+
+    def batch(self):
+        return _WriteBatch(self._target.batch())
+
+    def transaction(self, **kwargs):
+        return _Transaction(self._target.transaction(**kwargs))
+
+    def get_all(self, *args, **kwargs):
+        record_db(BACKEND, queries=1)
+        return _count_reads(self._call("get_all", *args, **kwargs))
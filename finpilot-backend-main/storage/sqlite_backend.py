@@ -0,0 +1,410 @@
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from config import EMAIL_INDEX_FALLBACK
+from services.metrics_service import record_db
+from storage.base import EmailTaken, StorageBackend, email_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_txn_user_date ON transactions (user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_txn_user_cat_date ON transactions (user_id, category, date, id);
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    total_debit REAL NOT NULL DEFAULT 0,
+    total_credit REAL NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month)
+);
+CREATE TABLE IF NOT EXISTS monthly_rollup_spent (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, category)
+);
+
+CREATE TABLE IF NOT EXISTS salaries (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    amount REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_salary_user_month ON salaries (user_id, month);
+
+CREATE TABLE IF NOT EXISTS allocations (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    categories TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alloc_user_month ON allocations (user_id, month);
+
+CREATE TABLE IF NOT EXISTS savings_goals (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_goal_user ON savings_goals (user_id);
+
+CREATE TABLE IF NOT EXISTS wrapped_snapshots (
+    user_id TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    computed_version INTEGER,
+    summary TEXT,
+    PRIMARY KEY (user_id, year)
+);
+
+CREATE TABLE IF NOT EXISTS health_warnings (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS user_emails (
+    email_key TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL
+);
+"""
+
+def _new_id() -> str:
+    # Same shape as Firestore auto IDs: 20 URL-safe characters
+    return uuid.uuid4().hex[:20]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Local backend for load tests, benchmarks and offline development.
+    path=":memory:" (the default) keeps everything in-process.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        # One connection shared by FastAPI's worker threads, serialized here
+        self.lock = threading.RLock()
+        with self.lock:
+            if path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self.lock:
+            changes = self.conn.total_changes
+            rows = self.conn.execute(sql, params).fetchall()
+            record_db("sqlite", queries=1, reads=len(rows), writes=self.conn.total_changes - changes)
+        return rows
+
+    def _atomic(self, *statements) -> None:
+        # Runs each callable inside one SQL transaction under the lock
+        with self.lock:
+            changes = self.conn.total_changes
+            self.conn.execute("BEGIN")
+            try:
+                for statement in statements:
+                    statement()
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            # Rows written, rollups included (the analogue of Firestore writes)
+            record_db("sqlite", writes=self.conn.total_changes - changes)
+
+    # ── Transactions ──
+    def _insert_transaction(self, txn: dict) -> str:
+        # Caller holds the lock and an open SQL transaction
+        txn_id = _new_id()
+        month = txn["date"][:7]
+        amount = txn.get("amount", 0)
+        is_debit = txn.get("type") == "debit"
+        is_credit = txn.get("type") == "credit"
+        self.conn.execute(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (txn_id, txn["user_id"], amount, txn.get("type", ""),
+             txn.get("category", "misc"), txn["date"], txn.get("description")),
+        )
+        self.conn.execute(
+            """INSERT INTO monthly_rollups VALUES (?, ?, ?, ?, 1)
+               ON CONFLICT (user_id, month) DO UPDATE SET
+                   total_debit = total_debit + excluded.total_debit,
+                   total_credit = total_credit + excluded.total_credit,
+                   transaction_count = transaction_count + 1""",
+            (txn["user_id"], month, amount if is_debit else 0, amount if is_credit else 0),
+        )
+        if is_debit:
+            self.conn.execute(
+                """INSERT INTO monthly_rollup_spent VALUES (?, ?, ?, ?)
+                   ON CONFLICT (user_id, month, category) DO UPDATE SET
+                       amount = amount + excluded.amount""",
+                (txn["user_id"], month, txn.get("category", "misc"), amount),
+            )
+        self._bump_snapshot(txn["user_id"], int(txn["date"][:4]))
+        return txn_id
+
+    def _bump_snapshot(self, user_id: str, year: int) -> None:
+        self.conn.execute(
+            """INSERT INTO wrapped_snapshots (user_id, year, version) VALUES (?, ?, 1)
+               ON CONFLICT (user_id, year) DO UPDATE SET version = version + 1""",
+            (user_id, year),
+        )
+
+    def add_transaction(self, txn: dict) -> str:
+        return self._write([txn])[0]
+
+    def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        try:
+            return self._write(txns)
+        except Exception as e:
+            return [e] * len(txns)
+
+    def _write(self, txns: List[dict]) -> List[str]:
+        # One SQL transaction: all rows and rollup updates land together
+        ids = []
+        self._atomic(lambda: ids.extend(self._insert_transaction(txn) for txn in txns))
+        return ids
+
+    def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[dict]:
+        clauses, params = ["user_id = ?"], [user_id]
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date < ?")
+            params.append(end)
+        if after is not None:
+            clauses.append("(date, id) < (?, ?)" if descending else "(date, id) > (?, ?)")
+            params.extend(after)
+        order = "DESC" if descending else "ASC"
+        sql = f"SELECT * FROM transactions WHERE {' AND '.join(clauses)} ORDER BY date {order}, id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._query(sql, params):
+            yield dict(row)
+
+    def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        totals = self._query(
+            "SELECT * FROM monthly_rollups WHERE user_id = ? AND month = ?", (user_id, month)
+        )
+        spent = self._query(
+            "SELECT category, amount FROM monthly_rollup_spent WHERE user_id = ? AND month = ?",
+            (user_id, month),
+        )
+        rollup = dict(totals[0]) if totals else {
+            "user_id": user_id,
+            "month": month,
+            "total_debit": 0,
+            "total_credit": 0,
+            "transaction_count": 0,
+        }
+        rollup["spent"] = {row["category"]: row["amount"] for row in spent}
+        return rollup
+
+    # ── Salaries & allocations ──
+    def _upsert_salary(self, row: dict) -> str:
+        # Caller holds the lock and an open SQL transaction
+        record_id = f"{row['user_id']}_{row['month']}"
+        self.conn.execute(
+            """INSERT INTO salaries VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET amount = excluded.amount, created_at = excluded.created_at""",
+            (record_id, row["user_id"], row["month"], row["amount"], _now()),
+        )
+        self.conn.execute(
+            """INSERT INTO allocations VALUES (?, ?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET categories = excluded.categories""",
+            (record_id, row["user_id"], row["month"], json.dumps(row["categories"])),
+        )
+        self._bump_snapshot(row["user_id"], int(row["month"][:4]))
+        return record_id
+
+    def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        self._atomic(lambda: self._upsert_salary(
+            {"user_id": user_id, "month": month, "amount": amount, "categories": categories}
+        ))
+
+    def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        record_ids = []
+        try:
+            self._atomic(lambda: record_ids.extend(self._upsert_salary(row) for row in rows))
+        except Exception as e:
+            return [e] * len(rows)
+        return record_ids
+
+    def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        clauses, params = ["user_id = ?"], [user_id]
+        if start_month is not None:
+            clauses.append("month >= ?")
+            params.append(start_month)
+        if end_month is not None:
+            clauses.append("month < ?")
+            params.append(end_month)
+        rows = self._query(f"SELECT * FROM salaries WHERE {' AND '.join(clauses)}", params)
+        return [dict(row) for row in rows]
+
+    def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        # Prefers the (user, month)-keyed row over ones saved with random IDs
+        rows = self._query(
+            "SELECT * FROM allocations WHERE user_id = ? AND month = ? ORDER BY id = ? DESC LIMIT 1",
+            (user_id, month, f"{user_id}_{month}"),
+        )
+        if not rows:
+            return None
+        alloc = dict(rows[0])
+        alloc["categories"] = json.loads(alloc["categories"])
+        return alloc
+
+    # ── Savings goals ──
+    def add_goal(self, goal: dict) -> str:
+        goal_id = _new_id()
+        self._atomic(
+            lambda: self.conn.execute(
+                "INSERT INTO savings_goals VALUES (?, ?, ?)", (goal_id, goal["user_id"], json.dumps(goal))
+            ),
+            lambda: self.conn.execute(
+                "UPDATE wrapped_snapshots SET version = version + 1 WHERE user_id = ?", (goal["user_id"],)
+            ),
+        )
+        return goal_id
+
+    def list_goals(self, user_id: str) -> List[dict]:
+        rows = self._query("SELECT id, data FROM savings_goals WHERE user_id = ?", (user_id,))
+        return [{**json.loads(row["data"]), "id": row["id"]} for row in rows]
+
+    # ── Wrapped snapshots ──
+    def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        rows = self._query(
+            "SELECT * FROM wrapped_snapshots WHERE user_id = ? AND year = ?", (user_id, year)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            "version": row["version"],
+            "computed_version": row["computed_version"],
+            "summary": json.loads(row["summary"]) if row["summary"] else None,
+        }
+
+    def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        self._query(
+            """INSERT INTO wrapped_snapshots (user_id, year, version, computed_version, summary)
+               VALUES (?, ?, 0, ?, ?)
+               ON CONFLICT (user_id, year) DO UPDATE SET
+                   computed_version = excluded.computed_version,
+                   summary = excluded.summary""",
+            (user_id, year, version, json.dumps(summary)),
+        )
+
+    # ── Financial-health warnings ──
+    def get_health_warning(self, user_id: str) -> Optional[dict]:
+        rows = self._query("SELECT data FROM health_warnings WHERE user_id = ?", (user_id,))
+        return json.loads(rows[0]["data"]) if rows else None
+
+    def save_health_warning(self, user_id: str, warning: dict) -> None:
+        self._query(
+            """INSERT INTO health_warnings VALUES (?, ?)
+               ON CONFLICT (user_id) DO UPDATE SET data = excluded.data""",
+            (user_id, json.dumps({**warning, "user_id": user_id})),
+        )
+
+    # ── One-off migrations ──
+    def normalize_transaction_dates(self) -> int:
+        # This backend postdates date validation on input: every row it holds
+        # is already zero-padded
+        return 0
+
+    def backfill_email_index(self) -> int:
+        rows = self._query(
+            "SELECT id, email FROM users WHERE id NOT IN (SELECT user_id FROM user_emails) ORDER BY id"
+        )
+        entries = [(email_key(row["email"]), row["id"]) for row in rows]
+        added = []
+        # OR IGNORE: legacy duplicates of one email keep the first user indexed
+        self._atomic(lambda: added.extend(
+            self.conn.execute("INSERT OR IGNORE INTO user_emails VALUES (?, ?)", entry).rowcount
+            for entry in entries
+        ))
+        return sum(added)
+
+    # ── Users ──
+    def create_user(self, user: dict) -> str:
+        user_id = _new_id()
+        record = {**user, "created_at": _now()}
+
+        def insert():
+            if EMAIL_INDEX_FALLBACK:
+                legacy = self.conn.execute(
+                    "SELECT 1 FROM users WHERE email = ? LIMIT 1", (user["email"],)
+                ).fetchone()
+                if legacy is not None:
+                    raise EmailTaken()
+            try:
+                self.conn.execute(
+                    "INSERT INTO user_emails VALUES (?, ?)", (email_key(user["email"]), user_id)
+                )
+            except sqlite3.IntegrityError:
+                raise EmailTaken()
+            self.conn.execute(
+                "INSERT INTO users VALUES (?, ?, ?)", (user_id, user["email"], json.dumps(record))
+            )
+
+        self._atomic(insert)
+        return user_id
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        rows = self._query("SELECT id, data FROM users WHERE id = ?", (user_id,))
+        return {**json.loads(rows[0]["data"]), "id": rows[0]["id"]} if rows else None
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        entry = self._query("SELECT user_id FROM user_emails WHERE email_key = ?", (email_key(email),))
+        if entry:
+            return self.get_user(entry[0]["user_id"])
+        if not EMAIL_INDEX_FALLBACK:
+            return None
+
+        rows = self._query("SELECT id, data FROM users WHERE email = ? LIMIT 1", (email,))
+        if not rows:
+            return None
+        self._query(
+            "INSERT OR IGNORE INTO user_emails VALUES (?, ?)", (email_key(email), rows[0]["id"])
+        )
+        return {**json.loads(rows[0]["data"]), "id": rows[0]["id"]}
@@ -0,0 +1,81 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from storage.base import AsyncStorageBackend, StorageBackend
+
+
+class ThreadedAsyncStorage(AsyncStorageBackend):
+    """
+    Async facade over a blocking backend (SQLite) that runs each call in a
+    worker thread, so local runs exercise the same async request path.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+
+    async def add_transaction(self, txn: dict) -> str:
+        return await asyncio.to_thread(self.backend.add_transaction, txn)
+
+    async def add_transactions(self, txns: List[dict]) -> List[Union[str, Exception]]:
+        return await asyncio.to_thread(self.backend.add_transactions, txns)
+
+    async def list_transactions(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> AsyncIterator[dict]:
+        rows = await asyncio.to_thread(
+            lambda: list(self.backend.list_transactions(
+                user_id, start, end, category, descending, limit, after
+            ))
+        )
+        for row in rows:
+            yield row
+
+    async def get_monthly_rollup(self, user_id: str, month: str) -> dict:
+        return await asyncio.to_thread(self.backend.get_monthly_rollup, user_id, month)
+
+    async def set_salary(self, user_id: str, month: str, amount: float, categories: Dict[str, float]) -> None:
+        await asyncio.to_thread(self.backend.set_salary, user_id, month, amount, categories)
+
+    async def set_salaries(self, rows: List[dict]) -> List[Union[str, Exception]]:
+        return await asyncio.to_thread(self.backend.set_salaries, rows)
+
+    async def list_salaries(
+        self, user_id: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> List[dict]:
+        return await asyncio.to_thread(self.backend.list_salaries, user_id, start_month, end_month)
+
+    async def get_allocation(self, user_id: str, month: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.backend.get_allocation, user_id, month)
+
+    async def add_goal(self, goal: dict) -> str:
+        return await asyncio.to_thread(self.backend.add_goal, goal)
+
+    async def list_goals(self, user_id: str) -> List[dict]:
+        return await asyncio.to_thread(self.backend.list_goals, user_id)
+
+    async def get_wrapped_snapshot(self, user_id: str, year: int) -> Optional[dict]:
+        return await asyncio.to_thread(self.backend.get_wrapped_snapshot, user_id, year)
+
+    async def save_wrapped_snapshot(self, user_id: str, year: int, summary: dict, version: int) -> None:
+        await asyncio.to_thread(self.backend.save_wrapped_snapshot, user_id, year, summary, version)
+
+    async def get_health_warning(self, user_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.backend.get_health_warning, user_id)
+
+    async def save_health_warning(self, user_id: str, warning: dict) -> None:
+        await asyncio.to_thread(self.backend.save_health_warning, user_id, warning)
+
+    async def create_user(self, user: dict) -> str:
+        return await asyncio.to_thread(self.backend.create_user, user)
+
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.backend.get_user, user_id)
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.backend.get_user_by_email, email)
@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
-import { api, AuthResponse } from '@/services/api';
+import { api, AuthResponse, SESSION_TOKEN_KEY } from '@/services/api';
 import { useNavigate } from 'react-router-dom';
 
 interface User {
@@ -44,6 +44,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       } catch (error) {
         console.error('Failed to parse stored user:', error);
         localStorage.removeItem('finpilot_user');
+        localStorage.removeItem(SESSION_TOKEN_KEY);
       }
     }
     setIsLoading(false);
@@ -59,6 +60,9 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       };
       setUser(userData);
       localStorage.setItem('finpilot_user', JSON.stringify(userData));
+      if (response.token) {
+        localStorage.setItem(SESSION_TOKEN_KEY, response.token);
+      }
     } catch (error) {
       console.error('Login failed:', error);
       throw error;
@@ -75,6 +79,9 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       };
       setUser(userData);
       localStorage.setItem('finpilot_user', JSON.stringify(userData));
+      if (response.token) {
+        localStorage.setItem(SESSION_TOKEN_KEY, response.token);
+      }
     } catch (error) {
       console.error('Registration failed:', error);
       throw error;
@@ -82,8 +89,13 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   };
 
   const logout = () => {
+    if (localStorage.getItem(SESSION_TOKEN_KEY)) {
+      // apiCall reads the token synchronously, so it can be cleared right after
+      api.auth.logout().catch(() => undefined);
+    }
     setUser(null);
     localStorage.removeItem('finpilot_user');
+    localStorage.removeItem(SESSION_TOKEN_KEY);
   };
 
   const value: AuthContextType = {
@@ -1,6 +1,9 @@
 // API Service for Backend Communication
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Session token issued by /auth/login and /auth/register
+export const SESSION_TOKEN_KEY = 'finpilot_token';
+
 // Helper function for API calls
 async function apiCall<T>(
   endpoint: string,
@@ -8,9 +11,13 @@ async function apiCall<T>(
 ): Promise<T> {
   const url = `${API_BASE_URL}${endpoint}`;
   
-  const defaultHeaders: HeadersInit = {
+  const defaultHeaders: Record<string, string> = {
     'Content-Type': 'application/json',
   };
+  const token = localStorage.getItem(SESSION_TOKEN_KEY);
+  if (token) {
+    defaultHeaders['Authorization'] = `Bearer ${token}`;
+  }
 
   const config: RequestInit = {
     ...options,
@@ -52,6 +59,8 @@ export interface AuthResponse {
   email: string;
   name: string;
   message: string;
+  token?: string;
+  expires_at?: number;
 }
 
 // Salary Service Types
@@ -183,6 +192,11 @@ export const api = {
         method: 'POST',
         body: JSON.stringify(data),
       }),
+
+    logout: () =>
+      apiCall<{ message: string }>('/auth/logout', {
+        method: 'POST',
+      }),
   },
 
   // Salary endpoints